@@ -0,0 +1,60 @@
+"""
+Memory kept in processed_data["features"] by each retention policy of bots/controllers/features.py, for the features
+DataFrame the MACD BB controller builds: the candles of a CandlesRingBuffer plus the columns of its streaming
+Bollinger Bands and MACD and the signal.
+
+Usage: python benchmarks/features_memory_benchmark.py [--records N] [--max-rows N]
+"""
+import argparse
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "bots"))
+
+from controllers.candles import CandlesRingBuffer  # noqa: E402
+from controllers.features import FeaturesRetention, retain_features  # noqa: E402
+from controllers.streaming_indicators import StreamingBollingerBands, StreamingMACD  # noqa: E402
+
+SIGNAL_COLUMNS = ["close", "BBP_100_2.0", "MACD_21_42_9", "MACDh_21_42_9", "signal"]
+
+
+def synthetic_features(n_records: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 0.5, n_records))
+    rows = np.column_stack([np.arange(n_records) * 60.0, close, close + rng.random(n_records),
+                            close - rng.random(n_records), close, rng.random(n_records)])
+    candles = CandlesRingBuffer(n_records)
+    candles.sync(rows)
+    bbands = StreamingBollingerBands(length=100, std=2.0, max_history=n_records)
+    macd = StreamingMACD(fast=21, slow=42, signal=9, max_history=n_records)
+    bbands.update(candles.view())
+    macd.update(candles.view())
+    features = candles.to_frame()
+    bbands.append_columns(features)
+    macd.append_columns(features)
+    long_condition = (features["BBP_100_2.0"] < 0.0) & (features["MACDh_21_42_9"] > 0) & (features["MACD_21_42_9"] < 0)
+    short_condition = (features["BBP_100_2.0"] > 1.0) & (features["MACDh_21_42_9"] < 0) & (features["MACD_21_42_9"] > 0)
+    features["signal"] = 0
+    features.loc[long_condition, "signal"] = 1
+    features.loc[short_condition, "signal"] = -1
+    return features
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--records", type=int, default=1000)
+    parser.add_argument("--max-rows", type=int, default=100)
+    args = parser.parse_args()
+    features = synthetic_features(args.records)
+    print(f"{'retention':<16}{'rows':>8}{'columns':>9}{'bytes':>12}")
+    for retention in FeaturesRetention:
+        retained = retain_features(features, retention, args.max_rows, SIGNAL_COLUMNS)
+        print(f"{retention.value:<16}{len(retained):>8}{len(retained.columns):>9}"
+              f"{retained.memory_usage(deep=True).sum():>12}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+"""
+Per-tick latency and allocations of GridStrike as the grid grows, driven by a stub market data provider and synthetic
+executors info. For each grid size it reports the first tick, which generates the grid levels, and the mean of the
+following ticks, which reuse them while executors are placed, filled and finished, plus the peak memory allocated
+during one of those ticks.
+
+It needs the hummingbot package (run it where the bots run, e.g. inside the hummingbot container).
+
+Usage: python benchmarks/grid_strike_benchmark.py [--ticks N] [--ranges N] [--executors-per-level F]
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+import tracemalloc
+from decimal import Decimal
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "bots"))
+
+from controllers.generic.grid_strike import GridRange, GridStrike, GridStrikeConfig  # noqa: E402
+from hummingbot.connector.trading_rule import TradingRule  # noqa: E402
+from hummingbot.core.data_type.common import TradeType  # noqa: E402
+from hummingbot.strategy_v2.models.base import RunnableStatus  # noqa: E402
+
+LEVELS = [10, 100, 1_000, 10_000, 50_000]
+START_PRICE = Decimal("40000")
+END_PRICE = Decimal("60000")
+
+
+class StubConnector:
+    """
+    Implements the connector methods used by GridStrike, with the price quantum of the trading rule.
+    """
+    def __init__(self, trading_rule: TradingRule):
+        self.trading_rule = trading_rule
+
+    def get_order_price_quantum(self, trading_pair: str, price: Decimal) -> Decimal:
+        return self.trading_rule.min_price_increment
+
+
+class StubMarketDataProvider:
+    """
+    Implements the market data provider methods used by GridStrike, with a mid price that follows a random walk.
+    """
+    def __init__(self, connector_name: str, trading_rule: TradingRule, mid_price: Decimal, seed: int = 0):
+        self.trading_rule = trading_rule
+        self.connectors = {connector_name: StubConnector(trading_rule)}
+        self.mid_price = mid_price
+        self._time = 1_700_000_000.0
+        self._rng = random.Random(seed)
+
+    def initialize_candles_feed(self, candles_config):
+        pass
+
+    def time(self) -> float:
+        return self._time
+
+    def tick(self):
+        self._time += 1
+        self.mid_price *= Decimal(1 + self._rng.gauss(0, 0.0005))
+
+    def get_trading_rules(self, connector_name: str, trading_pair: str) -> TradingRule:
+        return self.trading_rule
+
+    def get_price_by_type(self, connector_name: str, trading_pair: str, price_type) -> Decimal:
+        return self.mid_price
+
+    def quantize_order_amount(self, connector_name: str, trading_pair: str, amount: Decimal) -> Decimal:
+        return amount // self.trading_rule.min_base_amount_increment * self.trading_rule.min_base_amount_increment
+
+
+def synthetic_executor(executor_id: int, level) -> SimpleNamespace:
+    """
+    Executor info with the attributes GridStrike reads, placed at the price of a grid level.
+    """
+    return SimpleNamespace(id=f"executor_{executor_id}", side=level.side, is_active=True, is_trading=False,
+                           status=RunnableStatus.RUNNING, timestamp=0, custom_info={"level_id": level.id},
+                           config=SimpleNamespace(entry_price=level.price), filled_amount_quote=Decimal("0"),
+                           net_pnl_quote=Decimal("0"))
+
+
+def evolve_executors(executors, grid_levels, n_active: int, rng: random.Random, next_id: int) -> int:
+    """
+    Fills some placed executors, finishes some trading ones and places new ones to keep n_active executors active.
+    """
+    active = [executor for executor in executors if executor.is_active]
+    for executor in active:
+        if executor.is_trading and rng.random() < 0.02:
+            executor.is_active = False
+            executor.is_trading = False
+            executor.status = RunnableStatus.TERMINATED
+        elif not executor.is_trading and rng.random() < 0.02:
+            executor.is_trading = True
+    for _ in range(n_active - sum(executor.is_active for executor in executors)):
+        executors.append(synthetic_executor(next_id, rng.choice(grid_levels)))
+        next_id += 1
+    return next_id
+
+
+def build_controller(n_levels: int, n_ranges: int):
+    step = (END_PRICE - START_PRICE) / n_levels
+    trading_rule = TradingRule(trading_pair="BTC-USDT", min_order_size=Decimal("0.00001"), min_price_increment=step,
+                               min_base_amount_increment=Decimal("0.00001"), min_notional_size=Decimal("1"))
+    range_width = (END_PRICE - START_PRICE) / n_ranges
+    grid_ranges = [GridRange(id=f"R{i}", start_price=START_PRICE + i * range_width,
+                             end_price=START_PRICE + (i + 1) * range_width, total_amount_pct=Decimal(1) / n_ranges,
+                             side=TradeType.BUY if i < n_ranges / 2 else TradeType.SELL)
+                   for i in range(n_ranges)]
+    config = GridStrikeConfig(id="grid_strike_benchmark", total_amount_quote=Decimal(10 * n_levels),
+                              grid_ranges=grid_ranges, max_open_orders=5, min_order_amount=Decimal("1"))
+    market_data_provider = StubMarketDataProvider(config.connector_name, trading_rule, (START_PRICE + END_PRICE) / 2)
+    controller = GridStrike(config, market_data_provider, asyncio.Queue())
+    return controller, market_data_provider
+
+
+async def run_tick(controller: GridStrike):
+    await controller.update_processed_data()
+    return controller.determine_executor_actions()
+
+
+def time_tick(loop, controller: GridStrike) -> float:
+    start = time.perf_counter()
+    loop.run_until_complete(run_tick(controller))
+    return time.perf_counter() - start
+
+
+def trace_tick(loop, controller: GridStrike) -> int:
+    """
+    Runs a tick under tracemalloc and returns the peak of the memory allocated during it.
+    """
+    tracemalloc.start()
+    loop.run_until_complete(run_tick(controller))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--ticks", type=int, default=50)
+    parser.add_argument("--ranges", type=int, default=2)
+    parser.add_argument("--executors-per-level", type=float, default=0.1)
+    args = parser.parse_args()
+    print(f"{'levels':>8}{'executors':>11}{'first tick (ms)':>17}{'tick (ms)':>11}{'tick peak (KiB)':>17}")
+    loop = asyncio.new_event_loop()
+    for n_levels in LEVELS:
+        rng = random.Random(n_levels)
+        controller, market_data_provider = build_controller(n_levels, args.ranges)
+        controller.executors_info = []
+        first_elapsed = time_tick(loop, controller)
+        n_active = max(int(n_levels * args.executors_per_level), 1)
+        executors = []
+        next_id = 0
+        elapsed = 0.0
+        for _ in range(args.ticks):
+            market_data_provider.tick()
+            next_id = evolve_executors(executors, controller.grid_levels, n_active, rng, next_id)
+            controller.executors_info = list(executors)
+            elapsed += time_tick(loop, controller)
+        market_data_provider.tick()
+        next_id = evolve_executors(executors, controller.grid_levels, n_active, rng, next_id)
+        controller.executors_info = list(executors)
+        peak = trace_tick(loop, controller)
+        print(f"{n_levels:>8}{len(executors):>11}{first_elapsed * 1000:>17.3f}{elapsed / args.ticks * 1000:>11.3f}"
+              f"{peak / 1024:>17.1f}")
+    loop.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Per-call latency of the NumPy indicator kernels of bots/controllers/indicators.py on 1k, 10k and 100k candles,
+compared with pandas_ta when it is installed. Their parity with pandas_ta is checked by tests/test_indicators.py.
+
+Usage: python benchmarks/indicators_benchmark.py [--repeat N] [--pandas-ta-repeat N]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "bots"))
+
+from controllers import indicators  # noqa: E402
+
+try:
+    import pandas_ta as ta
+except ImportError:
+    ta = None
+
+SIZES = [1_000, 10_000, 100_000]
+
+
+def synthetic_candles(n_candles: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 0.5, n_candles))
+    high = close + rng.random(n_candles)
+    low = close - rng.random(n_candles)
+    return pd.DataFrame({"timestamp": np.arange(n_candles) * 60.0, "open": close, "high": high, "low": low,
+                         "close": close, "volume": rng.random(n_candles)})
+
+
+def kernels(df: pd.DataFrame):
+    high, low, close = df["high"].to_numpy(), df["low"].to_numpy(), df["close"].to_numpy()
+    return {
+        "bbands(100, 2.0)": lambda: indicators.bbands(close, 100, 2.0),
+        "macd(12, 26, 9)": lambda: indicators.macd(close, 12, 26, 9),
+        "natr(14)": lambda: indicators.natr(high, low, close, 14),
+        "supertrend(20, 4.0)": lambda: indicators.supertrend(high, low, close, 20, 4.0),
+    }
+
+
+def pandas_ta_calls(df: pd.DataFrame):
+    return {
+        "bbands(100, 2.0)": lambda: ta.bbands(df["close"], length=100, std=2.0),
+        "macd(12, 26, 9)": lambda: ta.macd(df["close"], fast=12, slow=26, signal=9),
+        "natr(14)": lambda: ta.natr(df["high"], df["low"], df["close"], length=14),
+        "supertrend(20, 4.0)": lambda: ta.supertrend(df["high"], df["low"], df["close"], length=20, multiplier=4.0),
+    }
+
+
+def time_call(func, repeat: int) -> float:
+    func()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--pandas-ta-repeat", type=int, default=1)
+    args = parser.parse_args()
+    print(f"numba acceleration: {'enabled' if indicators.NUMBA_ENABLED else 'disabled'}")
+    if ta is None:
+        print("pandas_ta is not installed, skipping the comparison")
+    print(f"{'indicator':<22}{'candles':>10}{'numpy (ms)':>14}{'pandas_ta (ms)':>16}")
+    for size in SIZES:
+        df = synthetic_candles(size)
+        reference = pandas_ta_calls(df) if ta is not None else {}
+        for name, kernel in kernels(df).items():
+            numpy_ms = time_call(kernel, args.repeat) * 1000
+            pandas_ta_ms = f"{time_call(reference[name], args.pandas_ta_repeat) * 1000:.3f}" if name in reference else "-"
+            print(f"{name:<22}{size:>10}{numpy_ms:>14.3f}{pandas_ta_ms:>16}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from controllers.streaming_indicators import HistoryBuffer
+from hummingbot.data_feed.candles_feed.data_types import CandlesConfig
+
+CANDLE_DTYPE = np.dtype([("timestamp", np.float64), ("open", np.float64), ("high", np.float64), ("low", np.float64),
+                         ("close", np.float64), ("volume", np.float64)])
+
+INTERVAL_UNITS_IN_SECONDS = {"s": 1, "m": 60, "h": 60 * 60, "d": 60 * 60 * 24, "w": 60 * 60 * 24 * 7,
+                             "M": 60 * 60 * 24 * 30}
+
+
+def interval_to_seconds(interval: str) -> int:
+    return int(interval[:-1]) * INTERVAL_UNITS_IN_SECONDS[interval[-1]]
+
+
+class CandleCloseGate:
+    """
+    Tells a controller whether a new candle opened since its last evaluation, so the indicators and the signal are only
+    recomputed once per candle. The check only uses the current time and the timestamp of the last candle processed:
+    if the feed is late delivering the new candle the controller keeps evaluating until it arrives.
+    """
+    def __init__(self, interval: str):
+        self.interval_seconds = interval_to_seconds(interval)
+        self.last_candle_timestamp: Optional[float] = None
+
+    def should_update(self, current_time: float, intra_candle: bool = False) -> bool:
+        if intra_candle or self.last_candle_timestamp is None:
+            return True
+        current_candle_timestamp = current_time - current_time % self.interval_seconds
+        return self.last_candle_timestamp < current_candle_timestamp
+
+    def processed(self, candles):
+        """
+        Records the last candle evaluated, from a candles view or DataFrame.
+        """
+        if len(candles) > 0:
+            self.last_candle_timestamp = float(np.asarray(candles["timestamp"])[-1])
+
+    @staticmethod
+    def last_value(values, intra_candle: bool = False):
+        """
+        Returns the value of the forming candle when evaluating intra candle, otherwise the one of the last closed
+        candle. values is a Series or an array aligned with the candles.
+        """
+        position = -1 if intra_candle or len(values) < 2 else -2
+        return getattr(values, "iloc", values)[position]
+
+
+class CandlesRingBuffer:
+    """
+    Structured NumPy buffer with the timestamp, open, high, low, close and volume of a candles feed. Each sync only
+    copies the candles that are new or revise the last one stored, and readers get read-only views of the most recent
+    rows instead of a new DataFrame every tick. to_frame is the adapter for code that still needs a DataFrame.
+    """
+    def __init__(self, capacity: int):
+        self._buffer = HistoryBuffer(capacity, dtype=CANDLE_DTYPE)
+
+    def __len__(self):
+        return len(self._buffer)
+
+    @property
+    def capacity(self) -> int:
+        return self._buffer.capacity
+
+    def ensure_capacity(self, capacity: int):
+        self._buffer.ensure_capacity(capacity)
+
+    def sync(self, rows: Sequence[Sequence[float]]):
+        """
+        Updates the buffer from the rows of a candles feed, oldest first, each one starting with timestamp, open, high,
+        low, close and volume. Only the tail of the rows is walked, up to the last candle stored.
+        """
+        if len(rows) == 0:
+            return
+        last = self._buffer.last()
+        if last is None or len(self) < min(len(rows), self.capacity):
+            self._load(rows)
+            return
+        last_timestamp = last["timestamp"]
+        pending = []
+        for row in reversed(rows):
+            pending.append(row)
+            if row[0] <= last_timestamp:
+                break
+        if pending[-1][0] != last_timestamp:
+            self._load(rows)
+            return
+        revised = tuple(pending.pop()[:6])
+        if revised != tuple(last.tolist()):
+            self._buffer.set_last(revised)
+        for row in reversed(pending):
+            self._buffer.append(tuple(row[:6]))
+
+    def sync_feed(self, feed):
+        """
+        Updates the buffer from the candles kept by a hummingbot candles feed. The rows the feed keeps internally are
+        read when available, to avoid building its DataFrame on every tick; otherwise the public candles_df is used.
+        """
+        rows = getattr(feed, "_candles", None)
+        if rows is None:
+            rows = feed.candles_df[list(CANDLE_DTYPE.names)].to_numpy(dtype=np.float64)
+        self.sync(rows)
+
+    def _load(self, rows: Sequence[Sequence[float]]):
+        rows = list(rows)[-self.capacity:]
+        values = np.array([row[:6] for row in rows], dtype=np.float64)
+        records = np.empty(len(rows), dtype=CANDLE_DTYPE)
+        for i, name in enumerate(CANDLE_DTYPE.names):
+            records[name] = values[:, i]
+        self._buffer.load(records)
+
+    def view(self, n: Optional[int] = None) -> np.ndarray:
+        """
+        Returns a read-only view of the last n candles (all of them by default).
+        """
+        candles = self._buffer.tail(len(self) if n is None else n)
+        candles.flags.writeable = False
+        return candles
+
+    def to_frame(self, n: Optional[int] = None) -> pd.DataFrame:
+        return pd.DataFrame(self.view(n))
+
+
+_shared_candles: Dict[Tuple[str, str, str], CandlesRingBuffer] = {}
+
+
+def get_shared_candles(candles_config: CandlesConfig) -> CandlesRingBuffer:
+    """
+    Returns the candles ring buffer shared by all the controllers of the bot that read the same candles feed. Its
+    capacity is the largest max_records requested.
+    """
+    key = (candles_config.connector, candles_config.trading_pair, candles_config.interval)
+    candles = _shared_candles.get(key)
+    if candles is None:
+        candles = CandlesRingBuffer(candles_config.max_records)
+        _shared_candles[key] = candles
+    else:
+        candles.ensure_capacity(candles_config.max_records)
+    return candles
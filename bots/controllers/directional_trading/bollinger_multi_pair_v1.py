@@ -0,0 +1,175 @@
+from decimal import Decimal
+from typing import Dict, List, Set
+
+import numpy as np
+from pydantic import Field, validator
+
+from controllers import indicators
+from controllers.candles import CandleCloseGate, get_shared_candles
+from controllers.executor_index import ExecutorIndex
+from hummingbot.client.config.config_data_types import ClientFieldData
+from hummingbot.core.data_type.common import PriceType, TradeType
+from hummingbot.data_feed.candles_feed.data_types import CandlesConfig
+from hummingbot.strategy_v2.controllers.directional_trading_controller_base import (
+    DirectionalTradingControllerBase,
+    DirectionalTradingControllerConfigBase,
+)
+from hummingbot.strategy_v2.executors.position_executor.data_types import PositionExecutorConfig
+from hummingbot.strategy_v2.models.executor_actions import CreateExecutorAction, ExecutorAction
+from hummingbot.strategy_v2.models.executors_info import ExecutorInfo
+
+
+class BollingerMultiPairV1ControllerConfig(DirectionalTradingControllerConfigBase):
+    """
+    Bollinger V1 for a list of trading pairs of the same connector. The total amount quote is split evenly between the
+    pairs and every pair uses the same triple barrier, max executors per side and cooldown settings.
+    """
+    controller_name = "bollinger_multi_pair_v1"
+    candles_config: List[CandlesConfig] = []
+    trading_pairs: List[str] = Field(
+        default="WLD-USDT,DOGE-USDT",
+        client_data=ClientFieldData(
+            prompt_on_new=True,
+            prompt=lambda mi: "Enter the trading pairs separated by commas: ", )
+    )
+    candles_connector: str = Field(
+        default=None,
+        client_data=ClientFieldData(
+            prompt_on_new=True,
+            prompt=lambda mi: "Enter the connector for the candles data, leave empty to use the same exchange as the connector: ", )
+    )
+    interval: str = Field(
+        default="3m",
+        client_data=ClientFieldData(
+            prompt=lambda mi: "Enter the candle interval (e.g., 1m, 5m, 1h, 1d): ",
+            prompt_on_new=False))
+    bb_length: int = Field(
+        default=100,
+        client_data=ClientFieldData(
+            prompt=lambda mi: "Enter the Bollinger Bands length: ",
+            prompt_on_new=True))
+    bb_std: float = Field(
+        default=2.0,
+        client_data=ClientFieldData(
+            prompt=lambda mi: "Enter the Bollinger Bands standard deviation: ",
+            prompt_on_new=False))
+    bb_long_threshold: float = Field(
+        default=0.0,
+        client_data=ClientFieldData(
+            prompt=lambda mi: "Enter the Bollinger Bands long threshold: ",
+            prompt_on_new=True))
+    bb_short_threshold: float = Field(
+        default=1.0,
+        client_data=ClientFieldData(
+            prompt=lambda mi: "Enter the Bollinger Bands short threshold: ",
+            prompt_on_new=True))
+    intra_candle_evaluation: bool = Field(
+        default=True,
+        client_data=ClientFieldData(
+            is_updatable=True,
+            prompt=lambda mi: "Evaluate the signal on every tick? Choose No to evaluate once per closed candle (Yes/No) ",
+            prompt_on_new=False))
+
+    @validator("trading_pairs", pre=True, always=True)
+    def parse_trading_pairs(cls, v):
+        if isinstance(v, str):
+            return [pair.strip() for pair in v.split(",") if pair.strip()]
+        return v
+
+    @validator("candles_connector", pre=True, always=True)
+    def set_candles_connector(cls, v, values):
+        if v is None or v == "":
+            return values.get("connector_name")
+        return v
+
+    def update_markets(self, markets: Dict[str, Set[str]]) -> Dict[str, Set[str]]:
+        if self.connector_name not in markets:
+            markets[self.connector_name] = set()
+        markets[self.connector_name].update(self.trading_pairs)
+        return markets
+
+
+class BollingerMultiPairV1Controller(DirectionalTradingControllerBase):
+    """
+    Evaluates the Bollinger Bands percent of all the trading pairs in one NumPy pass over a pairs x window matrix of
+    closes, built from the shared candles buffers, and creates position executors for each pair with a signal. The
+    active executors of each pair and side are looked up in an ExecutorIndex kept up to date across ticks.
+    """
+    def __init__(self, config: BollingerMultiPairV1ControllerConfig, *args, **kwargs):
+        self.config = config
+        self.max_records = self.config.bb_length + 1
+        if len(self.config.candles_config) == 0:
+            self.config.candles_config = [CandlesConfig(
+                connector=config.candles_connector,
+                trading_pair=trading_pair,
+                interval=config.interval,
+                max_records=self.max_records
+            ) for trading_pair in config.trading_pairs]
+        self.candle_gate = CandleCloseGate(config.interval)
+        self.candles = [get_shared_candles(candles_config) for candles_config in self.config.candles_config]
+        self._closes = np.full((len(self.candles), self.max_records), np.nan)
+        self.executor_index = ExecutorIndex(keys={"pair_side": self._executor_pair_side})
+        super().__init__(config, *args, **kwargs)
+
+    @staticmethod
+    def _executor_pair_side(executor: ExecutorInfo):
+        return executor.trading_pair, executor.side
+
+    async def update_processed_data(self):
+        if not self.candle_gate.should_update(self.market_data_provider.time(), self.config.intra_candle_evaluation):
+            return
+        self._closes.fill(np.nan)
+        last_timestamps = []
+        for i, (candles, candles_config) in enumerate(zip(self.candles, self.config.candles_config)):
+            candles.sync_feed(self.market_data_provider.get_candles_feed(candles_config))
+            view = candles.view(self.max_records)
+            if len(view) > 0:
+                self._closes[i, self.max_records - len(view):] = view["close"]
+                last_timestamps.append(view["timestamp"][-1])
+        bbp = indicators.bbands_percent_2d(self._closes, self.config.bb_length, self.config.bb_std)
+        bbp = bbp[:, -1] if self.config.intra_candle_evaluation else bbp[:, 0]
+        signals = np.where(bbp < self.config.bb_long_threshold, 1, np.where(bbp > self.config.bb_short_threshold, -1, 0))
+
+        self.processed_data["signals"] = dict(zip(self.config.trading_pairs, signals.tolist()))
+        self.processed_data["features"] = {"trading_pair": self.config.trading_pairs, "bbp": bbp, "signal": signals}
+        if len(last_timestamps) == len(self.candles):
+            # the gate only closes once every feed delivered the new candle
+            self.candle_gate.last_candle_timestamp = float(min(last_timestamps))
+
+    def create_actions_proposal(self) -> List[ExecutorAction]:
+        create_actions = []
+        signals = {trading_pair: signal for trading_pair, signal in self.processed_data.get("signals", {}).items()
+                   if signal != 0}
+        if not signals:
+            return create_actions
+        self.executor_index.update(self.executors_info)
+        for trading_pair, signal in signals.items():
+            trade_type = TradeType.BUY if signal > 0 else TradeType.SELL
+            if self.can_create_pair_executor(self.executor_index.by_key("pair_side", (trading_pair, trade_type))):
+                price = self.market_data_provider.get_price_by_type(self.config.connector_name, trading_pair,
+                                                                    PriceType.MidPrice)
+                amount = self.config.total_amount_quote / len(self.config.trading_pairs) / price / \
+                    Decimal(self.config.max_executors_per_side)
+                create_actions.append(CreateExecutorAction(
+                    controller_id=self.config.id,
+                    executor_config=self.get_pair_executor_config(trading_pair, trade_type, price, amount)))
+        return create_actions
+
+    def can_create_pair_executor(self, active_executors: List[ExecutorInfo]) -> bool:
+        max_timestamp = max([executor.timestamp for executor in active_executors], default=0)
+        active_executors_condition = len(active_executors) < self.config.max_executors_per_side
+        cooldown_condition = self.market_data_provider.time() - max_timestamp > self.config.cooldown_time
+        return active_executors_condition and cooldown_condition
+
+    def get_pair_executor_config(self, trading_pair: str, trade_type: TradeType, price: Decimal,
+                                 amount: Decimal) -> PositionExecutorConfig:
+        return PositionExecutorConfig(
+            timestamp=self.market_data_provider.time(),
+            connector_name=self.config.connector_name,
+            trading_pair=trading_pair,
+            side=trade_type,
+            entry_price=price,
+            amount=amount,
+            triple_barrier_config=self.config.triple_barrier_config,
+            leverage=self.config.leverage,
+        )
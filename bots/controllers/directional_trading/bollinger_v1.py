@@ -1,8 +1,13 @@
 from typing import List
 
-import pandas_ta as ta  # noqa: F401
+import numpy as np
+import pandas as pd
 from pydantic import Field, validator
 
+from controllers.candles import CandleCloseGate, get_shared_candles
+from controllers.features import FeaturesRetention, features_rows, retain_features
+from controllers.indicator_cache import get_shared_indicator
+from controllers.streaming_indicators import StreamingBollingerBands
 from hummingbot.client.config.config_data_types import ClientFieldData
 from hummingbot.data_feed.candles_feed.data_types import CandlesConfig
 from hummingbot.strategy_v2.controllers.directional_trading_controller_base import (
@@ -51,6 +56,24 @@ class BollingerV1ControllerConfig(DirectionalTradingControllerConfigBase):
         client_data=ClientFieldData(
             prompt=lambda mi: "Enter the Bollinger Bands short threshold: ",
             prompt_on_new=True))
+    intra_candle_evaluation: bool = Field(
+        default=True,
+        client_data=ClientFieldData(
+            is_updatable=True,
+            prompt=lambda mi: "Evaluate the signal on every tick? Choose No to evaluate once per closed candle (Yes/No) ",
+            prompt_on_new=False))
+    features_retention: FeaturesRetention = Field(
+        default=FeaturesRetention.FULL,
+        client_data=ClientFieldData(
+            is_updatable=True,
+            prompt=lambda mi: "Enter the features retention (full/last_rows/signal_columns/compact): ",
+            prompt_on_new=False))
+    features_max_rows: int = Field(
+        default=100,
+        client_data=ClientFieldData(
+            is_updatable=True,
+            prompt=lambda mi: "Enter the number of feature rows to keep with last_rows or compact retention: ",
+            prompt_on_new=False))
 
     @validator("candles_connector", pre=True, always=True)
     def set_candles_connector(cls, v, values):
@@ -76,26 +99,44 @@ class BollingerV1Controller(DirectionalTradingControllerBase):
                 interval=config.interval,
                 max_records=self.max_records
             )]
+        self.bbands = get_shared_indicator(config.candles_connector, config.candles_trading_pair, config.interval,
+                                           StreamingBollingerBands, max_history=self.max_records,
+                                           length=config.bb_length, std=config.bb_std)
+        self.candle_gate = CandleCloseGate(config.interval)
+        self.candles = get_shared_candles(self.config.candles_config[0])
         super().__init__(config, *args, **kwargs)
 
     async def update_processed_data(self):
-        df = self.market_data_provider.get_candles_df(connector_name=self.config.candles_connector,
-                                                      trading_pair=self.config.candles_trading_pair,
-                                                      interval=self.config.interval,
-                                                      max_records=self.max_records)
+        if not self.candle_gate.should_update(self.market_data_provider.time(), self.config.intra_candle_evaluation):
+            return
+        self.candles.sync_feed(self.market_data_provider.get_candles_feed(self.config.candles_config[0]))
+        candles = self.candles.view(self.max_records)
         # Add indicators
-        df.ta.bbands(length=self.config.bb_length, std=self.config.bb_std, append=True)
-        bbp = df[f"BBP_{self.config.bb_length}_{self.config.bb_std}"]
+        self.bbands.update(candles)
+        bbp = self.bbands.values(2)[:, self.bbands.columns.index(self.bbp_column)]
+
+        # Update processed data
+        self.processed_data["signal"] = self.candle_gate.last_value(self.get_signal(bbp),
+                                                                    self.config.intra_candle_evaluation)
+        self.processed_data["features"] = self.get_features()
+        self.candle_gate.processed(candles)
 
-        # Generate signal
+    @property
+    def bbp_column(self) -> str:
+        return f"BBP_{self.config.bb_length}_{self.config.bb_std}"
+
+    def get_signal(self, bbp: np.ndarray) -> np.ndarray:
         long_condition = bbp < self.config.bb_long_threshold
         short_condition = bbp > self.config.bb_short_threshold
+        return np.where(short_condition, -1, np.where(long_condition, 1, 0))
 
-        # Generate signal
-        df["signal"] = 0
-        df.loc[long_condition, "signal"] = 1
-        df.loc[short_condition, "signal"] = -1
-
-        # Update processed data
-        self.processed_data["signal"] = df["signal"].iloc[-1]
-        self.processed_data["features"] = df
+    def get_features(self) -> pd.DataFrame:
+        """
+        Builds the features DataFrame with only the candles kept by the features retention.
+        """
+        df = self.candles.to_frame(features_rows(self.config.features_retention, self.config.features_max_rows,
+                                                 self.max_records))
+        self.bbands.append_columns(df)
+        df["signal"] = self.get_signal(df[self.bbp_column].to_numpy())
+        return retain_features(df, self.config.features_retention, self.config.features_max_rows,
+                               ["close", self.bbp_column, "signal"])
@@ -2,9 +2,14 @@ import time
 from decimal import Decimal
 from typing import List, Optional, Tuple
 
-import pandas_ta as ta  # noqa: F401
+import numpy as np
+import pandas as pd
 from pydantic import Field, validator
 
+from controllers.candles import CandleCloseGate, get_shared_candles
+from controllers.features import FeaturesRetention, features_rows, retain_features
+from controllers.indicator_cache import get_shared_indicator
+from controllers.streaming_indicators import StreamingBollingerBands
 from hummingbot.client.config.config_data_types import ClientFieldData
 from hummingbot.core.data_type.common import TradeType
 from hummingbot.data_feed.candles_feed.data_types import CandlesConfig
@@ -58,6 +63,24 @@ class DManV3ControllerConfig(DirectionalTradingControllerConfigBase):
             is_updatable=True,
             prompt=lambda mi: "Enter the Bollinger Bands short threshold: ",
             prompt_on_new=True))
+    intra_candle_evaluation: bool = Field(
+        default=True,
+        client_data=ClientFieldData(
+            is_updatable=True,
+            prompt=lambda mi: "Evaluate the signal on every tick? Choose No to evaluate once per closed candle (Yes/No) ",
+            prompt_on_new=False))
+    features_retention: FeaturesRetention = Field(
+        default=FeaturesRetention.FULL,
+        client_data=ClientFieldData(
+            is_updatable=True,
+            prompt=lambda mi: "Enter the features retention (full/last_rows/signal_columns/compact): ",
+            prompt_on_new=False))
+    features_max_rows: int = Field(
+        default=100,
+        client_data=ClientFieldData(
+            is_updatable=True,
+            prompt=lambda mi: "Enter the number of feature rows to keep with last_rows or compact retention: ",
+            prompt_on_new=False))
     dca_spreads: List[Decimal] = Field(
         default="0.001,0.018,0.15,0.25",
         client_data=ClientFieldData(
@@ -161,34 +184,57 @@ class DManV3Controller(DirectionalTradingControllerBase):
                 interval=config.interval,
                 max_records=self.max_records
             )]
+        self.bbands = get_shared_indicator(config.candles_connector, config.candles_trading_pair, config.interval,
+                                           StreamingBollingerBands, max_history=self.max_records,
+                                           length=config.bb_length, std=config.bb_std)
+        self.candle_gate = CandleCloseGate(config.interval)
+        self.candles = get_shared_candles(self.config.candles_config[0])
         super().__init__(config, *args, **kwargs)
 
     async def update_processed_data(self):
-        df = self.market_data_provider.get_candles_df(connector_name=self.config.candles_connector,
-                                                      trading_pair=self.config.candles_trading_pair,
-                                                      interval=self.config.interval,
-                                                      max_records=self.max_records)
+        if not self.candle_gate.should_update(self.market_data_provider.time(), self.config.intra_candle_evaluation):
+            return
+        self.candles.sync_feed(self.market_data_provider.get_candles_feed(self.config.candles_config[0]))
+        candles = self.candles.view(self.max_records)
         # Add indicators
-        df.ta.bbands(length=self.config.bb_length, std=self.config.bb_std, append=True)
+        self.bbands.update(candles)
+        bbp = self.bbands.values(2)[:, self.bbands.columns.index(self.bbp_column)]
 
-        # Generate signal
-        long_condition = df[f"BBP_{self.config.bb_length}_{self.config.bb_std}"] < self.config.bb_long_threshold
-        short_condition = df[f"BBP_{self.config.bb_length}_{self.config.bb_std}"] > self.config.bb_short_threshold
+        # Update processed data
+        self.processed_data["signal"] = self.candle_gate.last_value(self.get_signal(bbp),
+                                                                    self.config.intra_candle_evaluation)
+        self.processed_data["features"] = self.get_features()
+        self.candle_gate.processed(candles)
 
-        # Generate signal
-        df["signal"] = 0
-        df.loc[long_condition, "signal"] = 1
-        df.loc[short_condition, "signal"] = -1
+    @property
+    def bbp_column(self) -> str:
+        return f"BBP_{self.config.bb_length}_{self.config.bb_std}"
 
-        # Update processed data
-        self.processed_data["signal"] = df["signal"].iloc[-1]
-        self.processed_data["features"] = df
+    @property
+    def bbb_column(self) -> str:
+        return f"BBB_{self.config.bb_length}_{self.config.bb_std}"
+
+    def get_signal(self, bbp: np.ndarray) -> np.ndarray:
+        long_condition = bbp < self.config.bb_long_threshold
+        short_condition = bbp > self.config.bb_short_threshold
+        return np.where(short_condition, -1, np.where(long_condition, 1, 0))
+
+    def get_features(self) -> pd.DataFrame:
+        """
+        Builds the features DataFrame with only the candles kept by the features retention.
+        """
+        df = self.candles.to_frame(features_rows(self.config.features_retention, self.config.features_max_rows,
+                                                 self.max_records))
+        self.bbands.append_columns(df)
+        df["signal"] = self.get_signal(df[self.bbp_column].to_numpy())
+        return retain_features(df, self.config.features_retention, self.config.features_max_rows,
+                               ["close", self.bbp_column, self.bbb_column, "signal"])
 
     def get_spread_multiplier(self) -> Decimal:
         if self.config.dynamic_order_spread:
-            df = self.processed_data["features"]
-            bb_width = df[f"BBB_{self.config.bb_length}_{self.config.bb_std}"].iloc[-1]
-            return Decimal(bb_width / 200)
+            bb_width = self.candle_gate.last_value(self.bbands.values(2)[:, self.bbands.columns.index(self.bbb_column)],
+                                                   self.config.intra_candle_evaluation)
+            return Decimal(float(bb_width) / 200)
         else:
             return Decimal("1.0")
 
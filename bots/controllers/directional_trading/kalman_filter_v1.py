@@ -0,0 +1,147 @@
+from typing import List
+
+import numpy as np
+import pandas as pd
+from pydantic import Field, validator
+
+from controllers.candles import CandleCloseGate, get_shared_candles
+from controllers.features import FeaturesRetention, features_rows, retain_features
+from controllers.indicator_cache import get_shared_indicator
+from controllers.streaming_indicators import StreamingKalmanFilter
+from hummingbot.client.config.config_data_types import ClientFieldData
+from hummingbot.data_feed.candles_feed.data_types import CandlesConfig
+from hummingbot.strategy_v2.controllers.directional_trading_controller_base import (
+    DirectionalTradingControllerBase,
+    DirectionalTradingControllerConfigBase,
+)
+
+
+class KalmanFilterV1ControllerConfig(DirectionalTradingControllerConfigBase):
+    controller_name = "kalman_filter_v1"
+    candles_config: List[CandlesConfig] = []
+    candles_connector: str = Field(
+        default=None,
+        client_data=ClientFieldData(
+            prompt_on_new=True,
+            prompt=lambda mi: "Enter the connector for the candles data, leave empty to use the same exchange as the connector: ", )
+    )
+    candles_trading_pair: str = Field(
+        default=None,
+        client_data=ClientFieldData(
+            prompt_on_new=True,
+            prompt=lambda mi: "Enter the trading pair for the candles data, leave empty to use the same trading pair as the connector: ", )
+    )
+    interval: str = Field(
+        default="3m",
+        client_data=ClientFieldData(
+            prompt=lambda mi: "Enter the candle interval (e.g., 1m, 5m, 1h, 1d): ",
+            prompt_on_new=False))
+    observation_covariance: float = Field(
+        default=1.0,
+        client_data=ClientFieldData(
+            prompt=lambda mi: "Enter the Kalman filter observation covariance: ",
+            prompt_on_new=True))
+    transition_covariance: float = Field(
+        default=0.001,
+        client_data=ClientFieldData(
+            prompt=lambda mi: "Enter the Kalman filter transition covariance: ",
+            prompt_on_new=True))
+    initial_state_covariance: float = Field(
+        default=0.001,
+        client_data=ClientFieldData(
+            prompt=lambda mi: "Enter the Kalman filter initial state covariance: ",
+            prompt_on_new=False))
+    max_records: int = Field(
+        default=1000,
+        client_data=ClientFieldData(
+            prompt=lambda mi: "Enter the number of candles used to warm up the Kalman filter: ",
+            prompt_on_new=False))
+    intra_candle_evaluation: bool = Field(
+        default=True,
+        client_data=ClientFieldData(
+            is_updatable=True,
+            prompt=lambda mi: "Evaluate the signal on every tick? Choose No to evaluate once per closed candle (Yes/No) ",
+            prompt_on_new=False))
+    features_retention: FeaturesRetention = Field(
+        default=FeaturesRetention.FULL,
+        client_data=ClientFieldData(
+            is_updatable=True,
+            prompt=lambda mi: "Enter the features retention (full/last_rows/signal_columns/compact): ",
+            prompt_on_new=False))
+    features_max_rows: int = Field(
+        default=100,
+        client_data=ClientFieldData(
+            is_updatable=True,
+            prompt=lambda mi: "Enter the number of feature rows to keep with last_rows or compact retention: ",
+            prompt_on_new=False))
+
+    @validator("candles_connector", pre=True, always=True)
+    def set_candles_connector(cls, v, values):
+        if v is None or v == "":
+            return values.get("connector_name")
+        return v
+
+    @validator("candles_trading_pair", pre=True, always=True)
+    def set_candles_trading_pair(cls, v, values):
+        if v is None or v == "":
+            return values.get("trading_pair")
+        return v
+
+
+class KalmanFilterV1Controller(DirectionalTradingControllerBase):
+    """
+    Trades the closes that leave the Kalman filter bands: long below the lower band and short above the upper band.
+    The filter state is advanced once per candle, so each evaluation is a constant time update.
+    """
+    def __init__(self, config: KalmanFilterV1ControllerConfig, *args, **kwargs):
+        self.config = config
+        self.max_records = self.config.max_records
+        if len(self.config.candles_config) == 0:
+            self.config.candles_config = [CandlesConfig(
+                connector=config.candles_connector,
+                trading_pair=config.candles_trading_pair,
+                interval=config.interval,
+                max_records=self.max_records
+            )]
+        self.kalman_filter = get_shared_indicator(config.candles_connector, config.candles_trading_pair,
+                                                  config.interval, StreamingKalmanFilter, max_history=self.max_records,
+                                                  observation_covariance=config.observation_covariance,
+                                                  transition_covariance=config.transition_covariance,
+                                                  initial_state_covariance=config.initial_state_covariance)
+        self.candle_gate = CandleCloseGate(config.interval)
+        self.candles = get_shared_candles(self.config.candles_config[0])
+        super().__init__(config, *args, **kwargs)
+
+    async def update_processed_data(self):
+        if not self.candle_gate.should_update(self.market_data_provider.time(), self.config.intra_candle_evaluation):
+            return
+        self.candles.sync_feed(self.market_data_provider.get_candles_feed(self.config.candles_config[0]))
+        candles = self.candles.view(self.max_records)
+        # Add indicators
+        self.kalman_filter.update(candles)
+        bands = self.kalman_filter.values(2)
+        close = candles["close"][len(candles) - len(bands):]
+
+        # Update processed data
+        signal = self.get_signal(close, bands[:, self.kalman_filter.columns.index("kf_upper")],
+                                 bands[:, self.kalman_filter.columns.index("kf_lower")])
+        self.processed_data["signal"] = self.candle_gate.last_value(signal, self.config.intra_candle_evaluation)
+        self.processed_data["features"] = self.get_features()
+        self.candle_gate.processed(candles)
+
+    @staticmethod
+    def get_signal(close: np.ndarray, kf_upper: np.ndarray, kf_lower: np.ndarray) -> np.ndarray:
+        long_condition = close < kf_lower
+        short_condition = close > kf_upper
+        return np.where(short_condition, -1, np.where(long_condition, 1, 0))
+
+    def get_features(self) -> pd.DataFrame:
+        """
+        Builds the features DataFrame with only the candles kept by the features retention.
+        """
+        df = self.candles.to_frame(features_rows(self.config.features_retention, self.config.features_max_rows,
+                                                 self.max_records))
+        self.kalman_filter.append_columns(df)
+        df["signal"] = self.get_signal(df["close"].to_numpy(), df["kf_upper"].to_numpy(), df["kf_lower"].to_numpy())
+        return retain_features(df, self.config.features_retention, self.config.features_max_rows,
+                               ["close", "kf", "kf_upper", "kf_lower", "signal"])
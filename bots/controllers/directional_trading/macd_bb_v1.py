@@ -1,8 +1,13 @@
 from typing import List
 
-import pandas_ta as ta  # noqa: F401
+import numpy as np
+import pandas as pd
 from pydantic import Field, validator
 
+from controllers.candles import CandleCloseGate, get_shared_candles
+from controllers.features import FeaturesRetention, features_rows, retain_features
+from controllers.indicator_cache import get_shared_indicator
+from controllers.streaming_indicators import StreamingBollingerBands, StreamingMACD
 from hummingbot.client.config.config_data_types import ClientFieldData
 from hummingbot.data_feed.candles_feed.data_types import CandlesConfig
 from hummingbot.strategy_v2.controllers.directional_trading_controller_base import (
@@ -66,6 +71,24 @@ class MACDBBV1ControllerConfig(DirectionalTradingControllerConfigBase):
         client_data=ClientFieldData(
             prompt=lambda mi: "Enter the MACD signal period: ",
             prompt_on_new=True))
+    intra_candle_evaluation: bool = Field(
+        default=True,
+        client_data=ClientFieldData(
+            is_updatable=True,
+            prompt=lambda mi: "Evaluate the signal on every tick? Choose No to evaluate once per closed candle (Yes/No) ",
+            prompt_on_new=False))
+    features_retention: FeaturesRetention = Field(
+        default=FeaturesRetention.FULL,
+        client_data=ClientFieldData(
+            is_updatable=True,
+            prompt=lambda mi: "Enter the features retention (full/last_rows/signal_columns/compact): ",
+            prompt_on_new=False))
+    features_max_rows: int = Field(
+        default=100,
+        client_data=ClientFieldData(
+            is_updatable=True,
+            prompt=lambda mi: "Enter the number of feature rows to keep with last_rows or compact retention: ",
+            prompt_on_new=False))
 
     @validator("candles_connector", pre=True, always=True)
     def set_candles_connector(cls, v, values):
@@ -92,29 +115,60 @@ class MACDBBV1Controller(DirectionalTradingControllerBase):
                 interval=config.interval,
                 max_records=self.max_records
             )]
+        self.bbands = get_shared_indicator(config.candles_connector, config.candles_trading_pair, config.interval,
+                                           StreamingBollingerBands, max_history=self.max_records,
+                                           length=config.bb_length, std=config.bb_std)
+        self.macd = get_shared_indicator(config.candles_connector, config.candles_trading_pair, config.interval,
+                                         StreamingMACD, max_history=self.max_records,
+                                         fast=config.macd_fast, slow=config.macd_slow, signal=config.macd_signal)
+        self.candle_gate = CandleCloseGate(config.interval)
+        self.candles = get_shared_candles(self.config.candles_config[0])
         super().__init__(config, *args, **kwargs)
 
     async def update_processed_data(self):
-        df = self.market_data_provider.get_candles_df(connector_name=self.config.candles_connector,
-                                                      trading_pair=self.config.candles_trading_pair,
-                                                      interval=self.config.interval,
-                                                      max_records=self.max_records)
+        if not self.candle_gate.should_update(self.market_data_provider.time(), self.config.intra_candle_evaluation):
+            return
+        self.candles.sync_feed(self.market_data_provider.get_candles_feed(self.config.candles_config[0]))
+        candles = self.candles.view(self.max_records)
         # Add indicators
-        df.ta.bbands(length=self.config.bb_length, std=self.config.bb_std, append=True)
-        df.ta.macd(fast=self.config.macd_fast, slow=self.config.macd_slow, signal=self.config.macd_signal, append=True)
+        self.bbands.update(candles)
+        self.macd.update(candles)
+        bbp = self.bbands.values(2)[:, self.bbands.columns.index(self.bbp_column)]
+        macd = self.macd.values(2)
 
-        bbp = df[f"BBP_{self.config.bb_length}_{self.config.bb_std}"]
-        macdh = df[f"MACDh_{self.config.macd_fast}_{self.config.macd_slow}_{self.config.macd_signal}"]
-        macd = df[f"MACD_{self.config.macd_fast}_{self.config.macd_slow}_{self.config.macd_signal}"]
+        # Update processed data
+        signal = self.get_signal(bbp, macd[:, self.macd.columns.index(self.macd_column)],
+                                 macd[:, self.macd.columns.index(self.macdh_column)])
+        self.processed_data["signal"] = self.candle_gate.last_value(signal, self.config.intra_candle_evaluation)
+        self.processed_data["features"] = self.get_features()
+        self.candle_gate.processed(candles)
+
+    @property
+    def bbp_column(self) -> str:
+        return f"BBP_{self.config.bb_length}_{self.config.bb_std}"
+
+    @property
+    def macd_column(self) -> str:
+        return f"MACD_{self.config.macd_fast}_{self.config.macd_slow}_{self.config.macd_signal}"
 
-        # Generate signal
+    @property
+    def macdh_column(self) -> str:
+        return f"MACDh_{self.config.macd_fast}_{self.config.macd_slow}_{self.config.macd_signal}"
+
+    def get_signal(self, bbp: np.ndarray, macd: np.ndarray, macdh: np.ndarray) -> np.ndarray:
         long_condition = (bbp < self.config.bb_long_threshold) & (macdh > 0) & (macd < 0)
         short_condition = (bbp > self.config.bb_short_threshold) & (macdh < 0) & (macd > 0)
+        return np.where(short_condition, -1, np.where(long_condition, 1, 0))
 
-        df["signal"] = 0
-        df.loc[long_condition, "signal"] = 1
-        df.loc[short_condition, "signal"] = -1
-
-        # Update processed data
-        self.processed_data["signal"] = df["signal"].iloc[-1]
-        self.processed_data["features"] = df
+    def get_features(self) -> pd.DataFrame:
+        """
+        Builds the features DataFrame with only the candles kept by the features retention.
+        """
+        df = self.candles.to_frame(features_rows(self.config.features_retention, self.config.features_max_rows,
+                                                 self.max_records))
+        self.bbands.append_columns(df)
+        self.macd.append_columns(df)
+        df["signal"] = self.get_signal(df[self.bbp_column].to_numpy(), df[self.macd_column].to_numpy(),
+                                       df[self.macdh_column].to_numpy())
+        return retain_features(df, self.config.features_retention, self.config.features_max_rows,
+                               ["close", self.bbp_column, self.macd_column, self.macdh_column, "signal"])
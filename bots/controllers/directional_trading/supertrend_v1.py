@@ -1,8 +1,13 @@
 from typing import List, Optional
 
-import pandas_ta as ta  # noqa: F401
+import numpy as np
+import pandas as pd
 from pydantic import Field, validator
 
+from controllers.candles import CandleCloseGate, get_shared_candles
+from controllers.features import FeaturesRetention, features_rows, retain_features
+from controllers.indicator_cache import get_shared_indicator
+from controllers.streaming_indicators import StreamingSuperTrend
 from hummingbot.client.config.config_data_types import ClientFieldData
 from hummingbot.data_feed.candles_feed.data_types import CandlesConfig
 from hummingbot.strategy_v2.controllers.directional_trading_controller_base import (
@@ -20,6 +25,9 @@ class SuperTrendConfig(DirectionalTradingControllerConfigBase):
     length: int = Field(default=20, client_data=ClientFieldData(prompt=lambda mi: "Enter the supertrend length: ", prompt_on_new=True))
     multiplier: float = Field(default=4.0, client_data=ClientFieldData(prompt=lambda mi: "Enter the supertrend multiplier: ", prompt_on_new=True))
     percentage_threshold: float = Field(default=0.01, client_data=ClientFieldData(prompt=lambda mi: "Enter the percentage threshold: ", prompt_on_new=True))
+    intra_candle_evaluation: bool = Field(default=True, client_data=ClientFieldData(is_updatable=True, prompt=lambda mi: "Evaluate the signal on every tick? Choose No to evaluate once per closed candle (Yes/No) ", prompt_on_new=False))
+    features_retention: FeaturesRetention = Field(default=FeaturesRetention.FULL, client_data=ClientFieldData(is_updatable=True, prompt=lambda mi: "Enter the features retention (full/last_rows/signal_columns/compact): ", prompt_on_new=False))
+    features_max_rows: int = Field(default=100, client_data=ClientFieldData(is_updatable=True, prompt=lambda mi: "Enter the number of feature rows to keep with last_rows or compact retention: ", prompt_on_new=False))
 
     @validator("candles_connector", pre=True, always=True)
     def set_candles_connector(cls, v, values):
@@ -45,26 +53,54 @@ class SuperTrend(DirectionalTradingControllerBase):
                 interval=config.interval,
                 max_records=self.max_records
             )]
+        self.supertrend = get_shared_indicator(config.candles_connector, config.candles_trading_pair, config.interval,
+                                               StreamingSuperTrend, max_history=self.max_records,
+                                               length=config.length, multiplier=config.multiplier)
+        self.candle_gate = CandleCloseGate(config.interval)
+        self.candles = get_shared_candles(self.config.candles_config[0])
         super().__init__(config, *args, **kwargs)
 
     async def update_processed_data(self):
-        df = self.market_data_provider.get_candles_df(connector_name=self.config.candles_connector,
-                                                      trading_pair=self.config.candles_trading_pair,
-                                                      interval=self.config.interval,
-                                                      max_records=self.max_records)
+        if not self.candle_gate.should_update(self.market_data_provider.time(), self.config.intra_candle_evaluation):
+            return
+        self.candles.sync_feed(self.market_data_provider.get_candles_feed(self.config.candles_config[0]))
+        candles = self.candles.view(self.max_records)
         # Add indicators
-        df.ta.supertrend(length=self.config.length, multiplier=self.config.multiplier, append=True)
-        df["percentage_distance"] = abs(df["close"] - df[f"SUPERT_{self.config.length}_{self.config.multiplier}"]) / df["close"]
+        self.supertrend.update(candles)
+        supertrend = self.supertrend.values(2)
+        close = candles["close"][len(candles) - len(supertrend):]
+        supertrend_line = supertrend[:, self.supertrend.columns.index(self.supertrend_column)]
+        percentage_distance = np.abs(close - supertrend_line) / close
 
-        # Generate long and short conditions
-        long_condition = (df[f"SUPERTd_{self.config.length}_{self.config.multiplier}"] == 1) & (df["percentage_distance"] < self.config.percentage_threshold)
-        short_condition = (df[f"SUPERTd_{self.config.length}_{self.config.multiplier}"] == -1) & (df["percentage_distance"] < self.config.percentage_threshold)
+        # Update processed data
+        signal = self.get_signal(supertrend[:, self.supertrend.columns.index(self.direction_column)],
+                                 percentage_distance)
+        self.processed_data["signal"] = self.candle_gate.last_value(signal, self.config.intra_candle_evaluation)
+        self.processed_data["features"] = self.get_features()
+        self.candle_gate.processed(candles)
 
-        # Choose side
-        df['signal'] = 0
-        df.loc[long_condition, 'signal'] = 1
-        df.loc[short_condition, 'signal'] = -1
+    @property
+    def supertrend_column(self) -> str:
+        return f"SUPERT_{self.config.length}_{self.config.multiplier}"
 
-        # Update processed data
-        self.processed_data["signal"] = df["signal"].iloc[-1]
-        self.processed_data["features"] = df
+    @property
+    def direction_column(self) -> str:
+        return f"SUPERTd_{self.config.length}_{self.config.multiplier}"
+
+    def get_signal(self, direction: np.ndarray, percentage_distance: np.ndarray) -> np.ndarray:
+        long_condition = (direction == 1) & (percentage_distance < self.config.percentage_threshold)
+        short_condition = (direction == -1) & (percentage_distance < self.config.percentage_threshold)
+        return np.where(short_condition, -1, np.where(long_condition, 1, 0))
+
+    def get_features(self) -> pd.DataFrame:
+        """
+        Builds the features DataFrame with only the candles kept by the features retention.
+        """
+        df = self.candles.to_frame(features_rows(self.config.features_retention, self.config.features_max_rows,
+                                                 self.max_records))
+        self.supertrend.append_columns(df)
+        df["percentage_distance"] = abs(df["close"] - df[self.supertrend_column]) / df["close"]
+        df["signal"] = self.get_signal(df[self.direction_column].to_numpy(), df["percentage_distance"].to_numpy())
+        return retain_features(df, self.config.features_retention, self.config.features_max_rows,
+                               ["close", self.supertrend_column, self.direction_column, "percentage_distance",
+                                "signal"])
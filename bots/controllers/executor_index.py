@@ -0,0 +1,176 @@
+from bisect import bisect_left, bisect_right
+from decimal import Decimal
+from typing import AbstractSet, Callable, Dict, Hashable, List, Optional, Set, Tuple
+
+from hummingbot.core.data_type.common import TradeType
+from hummingbot.strategy_v2.models.base import RunnableStatus
+from hummingbot.strategy_v2.models.executors_info import ExecutorInfo
+
+
+def executor_side(executor: ExecutorInfo) -> Hashable:
+    return executor.side
+
+
+def executor_level_id(executor: ExecutorInfo) -> Hashable:
+    return executor.custom_info.get("level_id")
+
+
+class ExecutorIndex:
+    """
+    Index of the active executors of a controller, kept up to date from the executors info of every tick.
+
+    The orchestrator hands the controller fresh ExecutorInfo snapshots every tick, including the executors that already
+    finished, so update walks them once: finished executors are remembered by id and skipped, new executors are bucketed
+    once by each key function (side and level id by default, plus the custom ones given), and only the executors whose
+    state changed move between structures. Lookups by status, key or placement are then dictionary reads. Executors
+    with an open order that is not filled yet (placed) are also kept sorted by entry price per side when their config
+    has one, so the ones beyond a price are found with a bisect. on_done is called once for each executor seen finished.
+    """
+    def __init__(self, keys: Optional[Dict[str, Callable[[ExecutorInfo], Hashable]]] = None,
+                 on_done: Optional[Callable[[ExecutorInfo], None]] = None):
+        self.keys = {"side": executor_side, "level_id": executor_level_id, **(keys or {})}
+        self.on_done = on_done
+        self._executors_info = None
+        self._active: Dict[str, ExecutorInfo] = {}
+        self._done_ids: Set[str] = set()
+        self._executor_keys: Dict[str, Dict[str, Hashable]] = {}
+        self._buckets: Dict[str, Dict[Hashable, Set[str]]] = {name: {} for name in self.keys}
+        self._status: Dict[str, RunnableStatus] = {}
+        self._by_status: Dict[RunnableStatus, Set[str]] = {}
+        self._placed_prices: Dict[TradeType, List[Decimal]] = {TradeType.BUY: [], TradeType.SELL: []}
+        self._placed_ids: Dict[TradeType, List[str]] = {TradeType.BUY: [], TradeType.SELL: []}
+        self._placed: Dict[str, Optional[Tuple[TradeType, Decimal]]] = {}
+
+    def __len__(self):
+        return len(self._active)
+
+    def update(self, executors_info: List[ExecutorInfo]):
+        """
+        Synchronizes the index with the executors info of the tick. The orchestrator replaces the list every tick, so
+        calling it again with the same list is a no-op and several methods of a controller can call it.
+        """
+        if executors_info is self._executors_info:
+            return
+        self._executors_info = executors_info
+        seen = set()
+        for executor in executors_info:
+            if executor.id in self._done_ids:
+                continue
+            if not executor.is_active:
+                self._done_ids.add(executor.id)
+                self._remove(executor.id)
+                if self.on_done is not None:
+                    self.on_done(executor)
+                continue
+            seen.add(executor.id)
+            if executor.id not in self._active:
+                self._add_keys(executor)
+            self._active[executor.id] = executor
+            if self._status.get(executor.id) != executor.status:
+                self._set_status(executor.id, executor.status)
+            if not executor.is_trading and executor.id not in self._placed:
+                self._add_placed(executor)
+            elif executor.is_trading and executor.id in self._placed:
+                self._remove_placed(executor.id)
+        for executor_id in self._active.keys() - seen:
+            self._remove(executor_id)
+
+    def _add_keys(self, executor: ExecutorInfo):
+        executor_keys = {}
+        for name, key_func in self.keys.items():
+            key = key_func(executor)
+            executor_keys[name] = key
+            self._buckets[name].setdefault(key, set()).add(executor.id)
+        self._executor_keys[executor.id] = executor_keys
+
+    def _set_status(self, executor_id: str, status: RunnableStatus):
+        previous = self._status.get(executor_id)
+        if previous is not None:
+            self._discard(self._by_status, previous, executor_id)
+        self._status[executor_id] = status
+        self._by_status.setdefault(status, set()).add(executor_id)
+
+    @staticmethod
+    def _discard(buckets: Dict[Hashable, Set[str]], key: Hashable, executor_id: str):
+        executor_ids = buckets[key]
+        executor_ids.discard(executor_id)
+        if not executor_ids:
+            del buckets[key]
+
+    def _remove(self, executor_id: str):
+        if self._active.pop(executor_id, None) is None:
+            return
+        for name, key in self._executor_keys.pop(executor_id).items():
+            self._discard(self._buckets[name], key, executor_id)
+        self._discard(self._by_status, self._status.pop(executor_id), executor_id)
+        if executor_id in self._placed:
+            self._remove_placed(executor_id)
+
+    def _add_placed(self, executor: ExecutorInfo):
+        price = getattr(executor.config, "entry_price", None)
+        if price is None or executor.side not in self._placed_prices:
+            self._placed[executor.id] = None
+            return
+        prices = self._placed_prices[executor.side]
+        position = bisect_right(prices, price)
+        prices.insert(position, price)
+        self._placed_ids[executor.side].insert(position, executor.id)
+        self._placed[executor.id] = (executor.side, price)
+
+    def _remove_placed(self, executor_id: str):
+        placement = self._placed.pop(executor_id)
+        if placement is None:
+            return
+        side, price = placement
+        prices = self._placed_prices[side]
+        executor_ids = self._placed_ids[side]
+        position = bisect_left(prices, price)
+        while executor_ids[position] != executor_id:
+            position += 1
+        del prices[position]
+        del executor_ids[position]
+
+    def active_executors(self) -> List[ExecutorInfo]:
+        return list(self._active.values())
+
+    def by_key(self, name: str, key: Hashable) -> List[ExecutorInfo]:
+        """
+        Returns the active executors for which the key function registered with the name returns the key.
+        """
+        return [self._active[executor_id] for executor_id in self._buckets[name].get(key, ())]
+
+    def count_by_key(self, name: str, key: Hashable) -> int:
+        return len(self._buckets[name].get(key, ()))
+
+    def by_status(self, status: RunnableStatus) -> List[ExecutorInfo]:
+        return [self._active[executor_id] for executor_id in self._by_status.get(status, ())]
+
+    def by_side(self, side: TradeType) -> List[ExecutorInfo]:
+        return self.by_key("side", side)
+
+    def by_level_id(self, level_id: str) -> List[ExecutorInfo]:
+        return self.by_key("level_id", level_id)
+
+    def active_level_ids(self) -> AbstractSet[str]:
+        """
+        Returns a live view of the level ids of the active executors.
+        """
+        return self._buckets["level_id"].keys()
+
+    def placed_executors(self) -> List[ExecutorInfo]:
+        return [self._active[executor_id] for executor_id in self._placed]
+
+    def trading_executors(self) -> List[ExecutorInfo]:
+        return [executor for executor_id, executor in self._active.items() if executor_id not in self._placed]
+
+    def placed_ids_at_or_below(self, side: TradeType, price: Decimal) -> List[str]:
+        """
+        Returns the ids of the placed executors of the side with an entry price lower than or equal to the price.
+        """
+        return self._placed_ids[side][:bisect_right(self._placed_prices[side], price)]
+
+    def placed_ids_at_or_above(self, side: TradeType, price: Decimal) -> List[str]:
+        """
+        Returns the ids of the placed executors of the side with an entry price greater than or equal to the price.
+        """
+        return self._placed_ids[side][bisect_left(self._placed_prices[side], price):]
@@ -0,0 +1,45 @@
+from enum import Enum
+from typing import List
+
+import numpy as np
+import pandas as pd
+
+
+class FeaturesRetention(str, Enum):
+    """
+    What a controller keeps of its features DataFrame in processed_data:
+    - full: the whole candles window with every indicator column.
+    - last_rows: the last features_max_rows rows with every column.
+    - signal_columns: every row, only the timestamp and the columns used to build the signal.
+    - compact: the last features_max_rows rows of the signal columns as float32.
+    """
+    FULL = "full"
+    LAST_ROWS = "last_rows"
+    SIGNAL_COLUMNS = "signal_columns"
+    COMPACT = "compact"
+
+
+def features_rows(retention: FeaturesRetention, max_rows: int, n_records: int) -> int:
+    """
+    Returns the number of candles the features DataFrame needs for the retention, so a controller only builds the
+    rows it keeps.
+    """
+    if retention in (FeaturesRetention.LAST_ROWS, FeaturesRetention.COMPACT):
+        return min(max_rows, n_records)
+    return n_records
+
+
+def retain_features(features: pd.DataFrame, retention: FeaturesRetention, max_rows: int,
+                    signal_columns: List[str]) -> pd.DataFrame:
+    """
+    Returns the part of the features to keep in processed_data. Every policy but full returns a copy, so the candles
+    window is not kept alive by a view of it.
+    """
+    if retention == FeaturesRetention.FULL:
+        return features
+    if retention == FeaturesRetention.LAST_ROWS:
+        return features.iloc[-max_rows:].copy()
+    columns = ["timestamp"] + [column for column in signal_columns if column != "timestamp"]
+    if retention == FeaturesRetention.SIGNAL_COLUMNS:
+        return features[columns].copy()
+    return features[columns].iloc[-max_rows:].astype({column: np.float32 for column in columns[1:]})
@@ -0,0 +1,67 @@
+from decimal import Decimal
+from typing import Dict, Optional, Tuple
+
+from hummingbot.core.data_type.common import OrderType, PositionAction, TradeType
+
+
+class FeeSchedule:
+    """
+    Cache of the percent fees returned by the connectors' get_fee, by connector, trading pair, order type, side, maker
+    or taker and position action. The percent fee does not depend on the amount or the price of the order, so after
+    the first call per key a fee is a dictionary read. The cache is cleared every refresh_interval seconds. The
+    connectors read the fee overrides from the config loaded in memory, so an edit of conf_fee_overrides.yml only
+    changes their fees once the config is reloaded, and reaches the cache at the next refresh after that.
+    """
+    def __init__(self, refresh_interval: float = 60 * 60):
+        self.refresh_interval = refresh_interval
+        self._fees: Dict[Tuple, Decimal] = {}
+        self._last_refresh: Optional[float] = None
+        self.refreshes = 0
+
+    def refresh_if_needed(self, current_time: float) -> bool:
+        """
+        Clears the cached fees if the refresh interval elapsed since the last refresh.
+        :return: True if the cache was cleared. refreshes counts the times it was, so callers deriving values from
+        the fees can tell when to derive them again.
+        """
+        if self._last_refresh is None or current_time - self._last_refresh >= self.refresh_interval:
+            self._fees.clear()
+            self._last_refresh = current_time
+            self.refreshes += 1
+            return True
+        return False
+
+    def fee_percent(self, connector, connector_name: str, trading_pair: str, order_type: OrderType,
+                    order_side: TradeType, is_maker: bool,
+                    position_action: PositionAction = PositionAction.NIL) -> Decimal:
+        key = (connector_name, trading_pair, order_type, order_side, is_maker, position_action)
+        fee = self._fees.get(key)
+        if fee is None:
+            base, quote = trading_pair.split("-")
+            # spot connectors do not take a position action
+            kwargs = {} if position_action == PositionAction.NIL else {"position_action": position_action}
+            fee = connector.get_fee(
+                base_currency=base,
+                quote_currency=quote,
+                order_type=order_type,
+                order_side=order_side,
+                amount=Decimal("1"),
+                price=Decimal("1"),
+                is_maker=is_maker,
+                **kwargs,
+            ).percent
+            self._fees[key] = fee
+        return fee
+
+
+_shared_fee_schedule: Optional[FeeSchedule] = None
+
+
+def get_shared_fee_schedule() -> FeeSchedule:
+    """
+    Returns the fee schedule shared by all the controllers of the bot.
+    """
+    global _shared_fee_schedule
+    if _shared_fee_schedule is None:
+        _shared_fee_schedule = FeeSchedule()
+    return _shared_fee_schedule
@@ -1,8 +1,14 @@
+import heapq
+from bisect import bisect_left, bisect_right
 from decimal import Decimal
-from typing import Dict, List, Optional, Set
+from itertools import islice
+from operator import itemgetter
+from typing import AbstractSet, Dict, Iterator, List, Optional, Set, Tuple
 
+import numpy as np
 from pydantic import BaseModel, Field
 
+from controllers.executor_index import ExecutorIndex
 from hummingbot.client.config.config_data_types import ClientFieldData
 from hummingbot.core.data_type.common import OrderType, PositionMode, PriceType, TradeType
 from hummingbot.core.data_type.trade_fee import TokenAmount
@@ -11,7 +17,6 @@ from hummingbot.strategy_v2.controllers import ControllerBase, ControllerConfigB
 from hummingbot.strategy_v2.executors.position_executor.data_types import PositionExecutorConfig, TripleBarrierConfig
 from hummingbot.strategy_v2.models.executor_actions import CreateExecutorAction, ExecutorAction, StopExecutorAction
 from hummingbot.strategy_v2.models.executors_info import ExecutorInfo
-from hummingbot.strategy_v2.utils.distributions import Distributions
 
 
 class GridRange(BaseModel):
@@ -49,6 +54,8 @@ class GridStrikeConfig(ControllerConfigBase):
                                                 client_data=ClientFieldData(is_updatable=True))
     max_open_orders: int = Field(default=5, client_data=ClientFieldData(is_updatable=True))
     grid_range_update_interval: int = Field(default=60, client_data=ClientFieldData(is_updatable=True))
+    grid_levels_mid_price_drift: Decimal = Field(default=Decimal("0.01"),
+                                                 client_data=ClientFieldData(is_updatable=True))
     extra_balance_base_usd: Decimal = Decimal("10")
 
     def update_markets(self, markets: Dict[str, Set[str]]) -> Dict[str, Set[str]]:
@@ -68,52 +75,131 @@ class GridLevel(BaseModel):
     take_profit_order_type: OrderType
 
 
+class GridLevelIndex:
+    """
+    Grid levels of each side sorted by price, so the levels closest to the mid price inside the activation bounds are
+    found with a bisect and a walk outwards from the mid price instead of scanning and sorting the whole grid.
+    """
+    def __init__(self, grid_levels: List[GridLevel]):
+        self.levels: Dict[TradeType, List[GridLevel]] = {}
+        self.prices: Dict[TradeType, List[Decimal]] = {}
+        for side in (TradeType.BUY, TradeType.SELL):
+            self.levels[side] = sorted((level for level in grid_levels if level.side == side),
+                                       key=lambda level: level.price)
+            self.prices[side] = [level.price for level in self.levels[side]]
+
+    def _closest(self, side: TradeType, mid_price: Decimal, lo: int, hi: int,
+                 excluded_ids: AbstractSet[str]) -> Iterator[Tuple[Decimal, GridLevel]]:
+        levels = self.levels[side]
+        prices = self.prices[side]
+        above = bisect_left(prices, mid_price, lo, hi)
+        below = above - 1
+        while below >= lo or above < hi:
+            if above >= hi or (below >= lo and mid_price - prices[below] <= prices[above] - mid_price):
+                level = levels[below]
+                below -= 1
+            else:
+                level = levels[above]
+                above += 1
+            if level.id not in excluded_ids:
+                yield abs(level.price - mid_price), level
+
+    def closest_levels(self, mid_price: Decimal, long_activation_bounds: Decimal, short_activation_bounds: Decimal,
+                       excluded_ids: AbstractSet[str], n: int) -> List[GridLevel]:
+        """
+        Returns the n levels closest to the mid price that are not excluded, with buy levels above the long activation
+        bounds and sell levels below the short activation bounds.
+        """
+        buy_prices = self.prices[TradeType.BUY]
+        sell_prices = self.prices[TradeType.SELL]
+        buys = self._closest(TradeType.BUY, mid_price, bisect_left(buy_prices, long_activation_bounds),
+                             len(buy_prices), excluded_ids)
+        sells = self._closest(TradeType.SELL, mid_price, 0, bisect_right(sell_prices, short_activation_bounds),
+                              excluded_ids)
+        return [level for _, level in islice(heapq.merge(buys, sells, key=itemgetter(0)), max(n, 0))]
+
+
 class GridStrike(ControllerBase):
     def __init__(self, config: GridStrikeConfig, *args, **kwargs):
         super().__init__(config, *args, **kwargs)
         self.config = config
         self._last_grid_levels_update = 0
+        self._grid_levels_key = None
+        self._grid_levels_mid_price = None
         self.trading_rules = None
         self.grid_levels = []
+        self.grid_levels_index = GridLevelIndex(self.grid_levels)
+        self.executor_index = ExecutorIndex(keys={"range_side": self._executor_range_key})
+
+    @staticmethod
+    def _executor_range_key(executor: ExecutorInfo):
+        return executor.custom_info["level_id"].split("_")[0], executor.side
+
+    def _grid_levels_cache_key(self):
+        return (
+            tuple(tuple(grid_range.dict().values()) for grid_range in self.config.grid_ranges),
+            self.config.total_amount_quote,
+            self.config.min_spread_between_orders,
+            self.config.min_order_amount,
+            self.trading_rules.min_price_increment,
+            self.trading_rules.min_notional_size,
+            self.trading_rules.min_order_size,
+            self.trading_rules.min_base_amount_increment,
+        )
 
     def _calculate_grid_config(self):
+        """
+        Returns the grid levels, reusing the ones computed before while the config and the trading rules are the same
+        and the mid price moved less than grid_levels_mid_price_drift since then.
+        """
         self.trading_rules = self.market_data_provider.get_trading_rules(self.config.connector_name,
                                                                          self.config.trading_pair)
+        mid_price = self.get_mid_price()
+        cache_key = self._grid_levels_cache_key()
+        if cache_key == self._grid_levels_key:
+            max_drift = self._grid_levels_mid_price * self.config.grid_levels_mid_price_drift
+            if abs(mid_price - self._grid_levels_mid_price) <= max_drift:
+                return self.grid_levels
+        self._grid_levels_key = cache_key
+        self._grid_levels_mid_price = mid_price
+        return self._generate_grid_levels(mid_price)
+
+    def _generate_grid_levels(self, mid_price: Decimal) -> List[GridLevel]:
         grid_levels = []
         if self.config.min_spread_between_orders:
-            spread_between_orders = self.config.min_spread_between_orders * self.get_mid_price()
+            spread_between_orders = self.config.min_spread_between_orders * mid_price
             step_proposed = max(self.trading_rules.min_price_increment, spread_between_orders)
         else:
             step_proposed = self.trading_rules.min_price_increment
         amount_proposed = max(self.trading_rules.min_notional_size, self.config.min_order_amount) if \
             self.config.min_order_amount else self.trading_rules.min_order_size
+        connector = self.market_data_provider.connectors[self.config.connector_name]
         for grid_range in self.config.grid_ranges:
             if grid_range.active:
                 total_amount = grid_range.total_amount_pct * self.config.total_amount_quote
                 theoretical_orders_by_step = (grid_range.end_price - grid_range.start_price) / step_proposed
                 theoretical_orders_by_amount = total_amount / amount_proposed
                 orders = int(min(theoretical_orders_by_step, theoretical_orders_by_amount))
-                prices = Distributions.linear(orders, float(grid_range.start_price), float(grid_range.end_price))
-                step = (grid_range.end_price - grid_range.start_price) / grid_range.end_price / orders
                 if orders == 0:
                     self.logger().warning(f"Grid range {grid_range.id} has no orders, change the parameters "
                                           f"(min order amount, amount pct, min spread between orders or total amount)")
-                amount_quote = total_amount / orders
-                for i, price in enumerate(prices):
-                    price_quantized = self.market_data_provider.quantize_order_price(
-                        self.config.connector_name,
-                        self.config.trading_pair, price)
-                    amount_quantized = self.market_data_provider.quantize_order_amount(
-                        self.config.connector_name,
-                        self.config.trading_pair, amount_quote / self.get_mid_price())
-                    # amount_quantized = amount_quote / self.get_mid_price()
-                    grid_levels.append(GridLevel(id=f"{grid_range.id}_P{i}",
-                                                 price=price_quantized,
-                                                 amount=amount_quantized,
-                                                 step=step, side=grid_range.side,
-                                                 open_order_type=grid_range.open_order_type,
-                                                 take_profit_order_type=grid_range.take_profit_order_type,
-                                                 ))
+                    continue
+                step = (grid_range.end_price - grid_range.start_price) / grid_range.end_price / orders
+                # same prices as Distributions.linear, floored to the connector price quantum as quantize_order_price
+                # does. The quantum is read once per range, assuming it does not change between its start and end price
+                price_quantum = connector.get_order_price_quantum(self.config.trading_pair, grid_range.start_price)
+                prices = np.linspace(float(grid_range.start_price), float(grid_range.end_price), orders)
+                ticks = np.floor(prices / float(price_quantum) + 1e-9).astype(np.int64)
+                amount_quantized = self.market_data_provider.quantize_order_amount(
+                    self.config.connector_name,
+                    self.config.trading_pair, total_amount / orders / mid_price)
+                grid_levels.extend(GridLevel.construct(id=f"{grid_range.id}_P{i}",
+                                                       price=Decimal(tick) * price_quantum,
+                                                       amount=amount_quantized,
+                                                       step=step, side=grid_range.side,
+                                                       open_order_type=grid_range.open_order_type,
+                                                       take_profit_order_type=grid_range.take_profit_order_type)
+                                   for i, tick in enumerate(ticks.tolist()))
         return grid_levels
 
     def get_balance_requirements(self) -> List[TokenAmount]:
@@ -130,18 +216,21 @@ class GridStrike(ControllerBase):
         )
 
     def active_executors(self, is_trading: bool) -> List[ExecutorInfo]:
-        return [
-            executor for executor in self.executors_info
-            if executor.is_active and executor.is_trading == is_trading
-        ]
+        if is_trading:
+            return self.executor_index.trading_executors()
+        return self.executor_index.placed_executors()
 
     def determine_executor_actions(self) -> List[ExecutorAction]:
-        if self.market_data_provider.time() - self._last_grid_levels_update > 60:
+        if self.market_data_provider.time() - self._last_grid_levels_update > self.config.grid_range_update_interval:
             self._last_grid_levels_update = self.market_data_provider.time()
-            self.grid_levels = self._calculate_grid_config()
+            grid_levels = self._calculate_grid_config()
+            if grid_levels is not self.grid_levels:
+                self.grid_levels = grid_levels
+                self.grid_levels_index = GridLevelIndex(grid_levels)
         return self.determine_create_executor_actions() + self.determine_stop_executor_actions()
 
     async def update_processed_data(self):
+        self.executor_index.update(self.executors_info)
         mid_price = self.get_mid_price()
         self.processed_data.update({
             "mid_price": mid_price,
@@ -155,17 +244,10 @@ class GridStrike(ControllerBase):
         mid_price = self.processed_data["mid_price"]
         long_activation_bounds = self.processed_data["long_activation_bounds"]
         short_activation_bounds = self.processed_data["short_activation_bounds"]
-        levels_allowed = []
-        for level in self.grid_levels:
-            if (level.side == TradeType.BUY and level.price >= long_activation_bounds) or \
-                    (level.side == TradeType.SELL and level.price <= short_activation_bounds):
-                levels_allowed.append(level)
-        active_executors = self.processed_data["active_executors_order_placed"] + \
-            self.processed_data["active_executors_order_trading"]
-        active_executors_level_id = [executor.custom_info["level_id"] for executor in active_executors]
-        levels_allowed = sorted([level for level in levels_allowed if level.id not in active_executors_level_id],
-                                key=lambda level: abs(level.price - mid_price))
-        levels_allowed = levels_allowed[:self.config.max_open_orders]
+        active_executors_level_id = self.executor_index.active_level_ids()
+        levels_allowed = self.grid_levels_index.closest_levels(mid_price, long_activation_bounds,
+                                                               short_activation_bounds, active_executors_level_id,
+                                                               self.config.max_open_orders)
         create_actions = []
         for level in levels_allowed:
             if level.side == TradeType.BUY and level.price > mid_price:
@@ -208,17 +290,12 @@ class GridStrike(ControllerBase):
     def determine_stop_executor_actions(self) -> List[ExecutorAction]:
         long_activation_bounds = self.processed_data["long_activation_bounds"]
         short_activation_bounds = self.processed_data["short_activation_bounds"]
-        active_executors_order_placed = self.processed_data["active_executors_order_placed"]
-        non_active_ranges = [grid_range.id for grid_range in self.config.grid_ranges if not grid_range.active]
-        active_executor_of_non_active_ranges = [executor.id for executor in self.executors_info if
-                                                executor.is_active and
-                                                executor.custom_info["level_id"].split("_")[0] in non_active_ranges]
-        long_executors_to_stop = [executor.id for executor in active_executors_order_placed if
-                                  executor.side == TradeType.BUY and
-                                  executor.config.entry_price <= long_activation_bounds]
-        short_executors_to_stop = [executor.id for executor in active_executors_order_placed if
-                                   executor.side == TradeType.SELL and
-                                   executor.config.entry_price >= short_activation_bounds]
+        active_executor_of_non_active_ranges = [
+            executor.id for grid_range in self.config.grid_ranges if not grid_range.active
+            for side in (TradeType.BUY, TradeType.SELL)
+            for executor in self.executor_index.by_key("range_side", (grid_range.id, side))]
+        long_executors_to_stop = self.executor_index.placed_ids_at_or_below(TradeType.BUY, long_activation_bounds)
+        short_executors_to_stop = self.executor_index.placed_ids_at_or_above(TradeType.SELL, short_activation_bounds)
         executors_id_to_stop = set(
             active_executor_of_non_active_ranges + long_executors_to_stop + short_executors_to_stop)
         return [StopExecutorAction(controller_id=self.config.id, executor_id=executor) for executor in
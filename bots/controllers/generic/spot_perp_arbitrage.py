@@ -2,9 +2,13 @@ import time
 from decimal import Decimal
 from typing import Dict, List, Set
 
+import numpy as np
 import pandas as pd
 from pydantic import Field, validator
 
+from controllers.executor_index import ExecutorIndex
+from controllers.fees import get_shared_fee_schedule
+from controllers.order_book import OrderBookMirror, get_shared_order_book
 from hummingbot.client.config.config_data_types import ClientFieldData
 from hummingbot.client.ui.interface_utils import format_df_for_printout
 from hummingbot.core.data_type.common import PriceType, TradeType, PositionAction, OrderType
@@ -71,6 +75,7 @@ class SpotPerpArbitrage(ControllerBase):
 
     def __init__(self, config: SpotPerpArbitrageConfig, *args, **kwargs):
         self.config = config
+        self.executor_index = ExecutorIndex()
         super().__init__(config, *args, **kwargs)
 
     @property
@@ -81,6 +86,16 @@ class SpotPerpArbitrage(ControllerBase):
     def perp_connector(self):
         return self.market_data_provider.connectors[self.config.perp_connector]
 
+    @property
+    def spot_order_book(self) -> OrderBookMirror:
+        return get_shared_order_book(self.market_data_provider, self.config.spot_connector,
+                                     self.config.spot_trading_pair)
+
+    @property
+    def perp_order_book(self) -> OrderBookMirror:
+        return get_shared_order_book(self.market_data_provider, self.config.perp_connector,
+                                     self.config.perp_trading_pair)
+
     def get_current_profitability_after_fees(self):
         """
         This methods compares the profitability of buying at market in the two exchanges. If the side is TradeType.BUY
@@ -89,53 +104,33 @@ class SpotPerpArbitrage(ControllerBase):
         spot_trading_pair = self.config.spot_trading_pair
         perp_trading_pair = self.config.perp_trading_pair
 
-        connector_spot_price = Decimal(self.market_data_provider.get_price_for_quote_volume(
-            connector_name=self.config.spot_connector,
-            trading_pair=spot_trading_pair,
-            quote_volume=self.config.position_size_quote,
-            is_buy=True,
-        ).result_price)
-        connector_perp_price = Decimal(self.market_data_provider.get_price_for_quote_volume(
-            connector_name=self.config.spot_connector,
-            trading_pair=perp_trading_pair,
-            quote_volume=self.config.position_size_quote,
-            is_buy=False,
-        ).result_price)
-        estimated_fees_spot_connector = self.spot_connector.get_fee(
-            base_currency=spot_trading_pair.split("-")[0],
-            quote_currency=spot_trading_pair.split("-")[1],
-            order_type=OrderType.MARKET,
-            order_side=TradeType.BUY,
-            amount=self.config.position_size_quote / float(connector_spot_price),
-            price=connector_spot_price,
-            is_maker=False,
-        ).percent
-        estimated_fees_perp_connector = self.perp_connector.get_fee(
-            base_currency=perp_trading_pair.split("-")[0],
-            quote_currency=perp_trading_pair.split("-")[1],
-            order_type=OrderType.MARKET,
-            order_side=TradeType.BUY,
-            amount=self.config.position_size_quote / float(connector_perp_price),
-            price=connector_perp_price,
-            is_maker=False,
-            position_action=PositionAction.OPEN
-        ).percent
+        spot_price = self.spot_order_book.price_for_quote_volume(True, self.config.position_size_quote)
+        perp_price = self.perp_order_book.price_for_quote_volume(False, self.config.position_size_quote)
+        if np.isnan(spot_price) or np.isnan(perp_price):
+            # one of the books does not have enough depth to fill the position
+            return Decimal("-Infinity")
+        connector_spot_price = Decimal(float(spot_price))
+        connector_perp_price = Decimal(float(perp_price))
+        fee_schedule = get_shared_fee_schedule()
+        fee_schedule.refresh_if_needed(self.market_data_provider.time())
+        estimated_fees_spot_connector = fee_schedule.fee_percent(
+            self.spot_connector, self.config.spot_connector, spot_trading_pair,
+            order_type=OrderType.MARKET, order_side=TradeType.BUY, is_maker=False)
+        estimated_fees_perp_connector = fee_schedule.fee_percent(
+            self.perp_connector, self.config.perp_connector, perp_trading_pair,
+            order_type=OrderType.MARKET, order_side=TradeType.BUY, is_maker=False,
+            position_action=PositionAction.OPEN)
 
         estimated_trade_pnl_pct = (connector_perp_price - connector_spot_price) / connector_spot_price
         return estimated_trade_pnl_pct - estimated_fees_spot_connector - estimated_fees_perp_connector
 
     def is_active_arbitrage(self):
-        executors = self.filter_executors(
-            executors=self.executors_info,
-            filter_func=lambda e: e.is_active
-        )
-        return len(executors) > 0
+        self.executor_index.update(self.executors_info)
+        return len(self.executor_index) > 0
 
     def current_pnl_pct(self):
-        executors = self.filter_executors(
-            executors=self.executors_info,
-            filter_func=lambda e: e.is_active
-        )
+        self.executor_index.update(self.executors_info)
+        executors = self.executor_index.active_executors()
         filled_amount = sum(e.filled_amount_quote for e in executors)
         return sum(e.net_pnl_quote for e in executors) / filled_amount if filled_amount > 0 else 0
 
@@ -178,17 +173,15 @@ class SpotPerpArbitrage(ControllerBase):
                     triple_barrier_config=TripleBarrierConfig(open_order_type=OrderType.MARKET),
                 ))
             )
-            return create_actions
+        return create_actions
 
     def stop_arbitrage_actions(self):
         stop_actions = []
         if self.processed_data["current_pnl"] > 0.003:
-            executors = self.filter_executors(
-                executors=self.executors_info,
-                filter_func=lambda e: e.is_active
-            )
-            for executor in executors:
+            self.executor_index.update(self.executors_info)
+            for executor in self.executor_index.active_executors():
                 stop_actions.append(StopExecutorAction(controller_id=self.config.id, executor_id=executor.id))
+        return stop_actions
 
     def to_format_status(self) -> List[str]:
         return [f"Current profitability: {self.processed_data['profitability']} | Min profitability: {self.config.profitability}",
@@ -0,0 +1,221 @@
+from decimal import Decimal
+from typing import Dict, List, Optional, Set
+
+import numpy as np
+import pandas as pd
+from pydantic import Field, validator
+
+from controllers.executor_index import ExecutorIndex
+from controllers.fees import get_shared_fee_schedule
+from controllers.order_book import get_shared_order_book
+from hummingbot.client.config.config_data_types import ClientFieldData
+from hummingbot.client.ui.interface_utils import format_df_for_printout
+from hummingbot.core.data_type.common import OrderType, PositionAction, TradeType
+from hummingbot.data_feed.candles_feed.data_types import CandlesConfig
+from hummingbot.strategy_v2.controllers.controller_base import ControllerBase, ControllerConfigBase
+from hummingbot.strategy_v2.executors.position_executor.data_types import PositionExecutorConfig, \
+    TripleBarrierConfig
+from hummingbot.strategy_v2.models.executor_actions import CreateExecutorAction, ExecutorAction, StopExecutorAction
+from hummingbot.strategy_v2.models.executors_info import ExecutorInfo
+
+
+class SpotPerpBasisScannerConfig(ControllerConfigBase):
+    """
+    Spot perp arbitrage over a list of trading pairs quoted with the same name in the spot and the perp connectors.
+    """
+    controller_name: str = "spot_perp_basis_scanner"
+    candles_config: List[CandlesConfig] = []
+    spot_connector: str = Field(
+        default="binance",
+        client_data=ClientFieldData(
+            prompt=lambda e: "Enter the spot connector: ",
+            prompt_on_new=True
+        ))
+    perp_connector: str = Field(
+        default="binance_perpetual",
+        client_data=ClientFieldData(
+            prompt=lambda e: "Enter the perp connector: ",
+            prompt_on_new=True
+        ))
+    trading_pairs: List[str] = Field(
+        default="DOGE-USDT,WLD-USDT,SOL-USDT",
+        client_data=ClientFieldData(
+            prompt=lambda e: "Enter the trading pairs separated by commas: ",
+            prompt_on_new=True
+        ))
+    profitability: Decimal = Field(
+        default=0.002,
+        client_data=ClientFieldData(
+            prompt=lambda e: "Enter the minimum profitability: ",
+            prompt_on_new=True
+        ))
+    position_size_quote: float = Field(
+        default=50,
+        client_data=ClientFieldData(
+            prompt=lambda e: "Enter the position size in quote currency: ",
+            prompt_on_new=True
+        ))
+    max_positions: int = Field(
+        default=3,
+        client_data=ClientFieldData(
+            prompt=lambda e: "Enter the maximum number of pairs with an open arbitrage: ",
+            prompt_on_new=True
+        ))
+    take_profit_pnl: Decimal = Field(
+        default=0.003,
+        client_data=ClientFieldData(
+            is_updatable=True,
+            prompt=lambda e: "Enter the net PnL of an arbitrage to close it: ",
+            prompt_on_new=False
+        ))
+
+    @validator("trading_pairs", pre=True, always=True)
+    def parse_trading_pairs(cls, v):
+        if isinstance(v, str):
+            return [pair.strip() for pair in v.split(",") if pair.strip()]
+        return v
+
+    def update_markets(self, markets: Dict[str, Set[str]]) -> Dict[str, Set[str]]:
+        for connector_name in (self.spot_connector, self.perp_connector):
+            if connector_name not in markets:
+                markets[connector_name] = set()
+            markets[connector_name].update(self.trading_pairs)
+        return markets
+
+
+class SpotPerpBasisScanner(ControllerBase):
+    """
+    Computes the fee adjusted basis of buying spot and selling perp at market for all the trading pairs in one NumPy
+    pass per tick, ranks them and opens an arbitrage only on the best pairs, up to max_positions at the same time.
+    The books come from the depth bounded mirrors shared by all the controllers of the bot, and the fee vector is only
+    rebuilt when the shared fee schedule is refreshed.
+    """
+    def __init__(self, config: SpotPerpBasisScannerConfig, *args, **kwargs):
+        self.config = config
+        self.executor_index = ExecutorIndex(keys={"trading_pair": self._executor_trading_pair})
+        n_pairs = len(self.config.trading_pairs)
+        self._spot_prices = np.full(n_pairs, np.nan)
+        self._perp_prices = np.full(n_pairs, np.nan)
+        self._fees = np.zeros(n_pairs)
+        self._fees_refresh: Optional[int] = None
+        super().__init__(config, *args, **kwargs)
+
+    @staticmethod
+    def _executor_trading_pair(executor: ExecutorInfo):
+        return executor.trading_pair
+
+    @property
+    def spot_connector(self):
+        return self.market_data_provider.connectors[self.config.spot_connector]
+
+    @property
+    def perp_connector(self):
+        return self.market_data_provider.connectors[self.config.perp_connector]
+
+    def update_fees(self):
+        """
+        Rebuilds the vector with the fees of both legs of each trading pair after the shared fee schedule is refreshed.
+        """
+        fee_schedule = get_shared_fee_schedule()
+        fee_schedule.refresh_if_needed(self.market_data_provider.time())
+        if self._fees_refresh == fee_schedule.refreshes:
+            return
+        for i, trading_pair in enumerate(self.config.trading_pairs):
+            self._fees[i] = fee_schedule.fee_percent(
+                self.spot_connector, self.config.spot_connector, trading_pair,
+                order_type=OrderType.MARKET, order_side=TradeType.BUY, is_maker=False) + fee_schedule.fee_percent(
+                self.perp_connector, self.config.perp_connector, trading_pair,
+                order_type=OrderType.MARKET, order_side=TradeType.BUY, is_maker=False,
+                position_action=PositionAction.OPEN)
+        self._fees_refresh = fee_schedule.refreshes
+
+    def get_basis_after_fees(self) -> np.ndarray:
+        """
+        Returns the basis of each trading pair after the fees of both legs, -inf where one of the books does not have
+        enough depth within the mirrored levels to fill the position.
+        """
+        self.update_fees()
+        for i, trading_pair in enumerate(self.config.trading_pairs):
+            spot_book = get_shared_order_book(self.market_data_provider, self.config.spot_connector, trading_pair)
+            perp_book = get_shared_order_book(self.market_data_provider, self.config.perp_connector, trading_pair)
+            self._spot_prices[i] = spot_book.price_for_quote_volume(True, self.config.position_size_quote)
+            self._perp_prices[i] = perp_book.price_for_quote_volume(False, self.config.position_size_quote)
+        basis = (self._perp_prices - self._spot_prices) / self._spot_prices - self._fees
+        return np.where(np.isnan(basis), -np.inf, basis)
+
+    def current_pnl_pct(self, trading_pair: str) -> Decimal:
+        executors = self.executor_index.by_key("trading_pair", trading_pair)
+        filled_amount = sum(e.filled_amount_quote for e in executors)
+        return sum(e.net_pnl_quote for e in executors) / filled_amount if filled_amount > 0 else Decimal("0")
+
+    async def update_processed_data(self):
+        self.executor_index.update(self.executors_info)
+        basis = self.get_basis_after_fees()
+        ranking = np.argsort(-basis, kind="stable")
+        active_pairs = [trading_pair for trading_pair in self.config.trading_pairs
+                        if self.executor_index.count_by_key("trading_pair", trading_pair) > 0]
+        self.processed_data = {
+            "basis": basis,
+            "ranking": [self.config.trading_pairs[i] for i in ranking],
+            "active_pairs": active_pairs,
+            "current_pnl": {trading_pair: self.current_pnl_pct(trading_pair) for trading_pair in active_pairs},
+        }
+
+    def determine_executor_actions(self) -> List[ExecutorAction]:
+        executor_actions = []
+        executor_actions.extend(self.create_new_arbitrage_actions())
+        executor_actions.extend(self.stop_arbitrage_actions())
+        return executor_actions
+
+    def create_new_arbitrage_actions(self) -> List[ExecutorAction]:
+        create_actions = []
+        active_pairs = set(self.processed_data["active_pairs"])
+        available_positions = self.config.max_positions - len(active_pairs)
+        if available_positions <= 0:
+            return create_actions
+        basis = dict(zip(self.config.trading_pairs, self.processed_data["basis"].tolist()))
+        for trading_pair in self.processed_data["ranking"]:
+            if available_positions == 0 or basis[trading_pair] <= self.config.profitability:
+                break
+            if trading_pair in active_pairs:
+                continue
+            create_actions.extend(self.get_arbitrage_actions(trading_pair))
+            available_positions -= 1
+        return create_actions
+
+    def get_arbitrage_actions(self, trading_pair: str) -> List[ExecutorAction]:
+        mid_price = get_shared_order_book(self.market_data_provider, self.config.spot_connector,
+                                          trading_pair).mid_price
+        amount = Decimal(self.config.position_size_quote) / Decimal(float(mid_price))
+        return [CreateExecutorAction(
+            controller_id=self.config.id,
+            executor_config=PositionExecutorConfig(
+                timestamp=self.market_data_provider.time(),
+                connector_name=connector_name,
+                trading_pair=trading_pair,
+                side=side,
+                amount=amount,
+                triple_barrier_config=TripleBarrierConfig(open_order_type=OrderType.MARKET),
+            )) for connector_name, side in ((self.config.spot_connector, TradeType.BUY),
+                                            (self.config.perp_connector, TradeType.SELL))]
+
+    def stop_arbitrage_actions(self) -> List[ExecutorAction]:
+        stop_actions = []
+        for trading_pair, pnl in self.processed_data["current_pnl"].items():
+            if pnl > self.config.take_profit_pnl:
+                stop_actions.extend(StopExecutorAction(controller_id=self.config.id, executor_id=executor.id)
+                                    for executor in self.executor_index.by_key("trading_pair", trading_pair))
+        return stop_actions
+
+    def to_format_status(self) -> List[str]:
+        basis = dict(zip(self.config.trading_pairs, self.processed_data["basis"].tolist()))
+        top_pairs = self.processed_data["ranking"][:max(self.config.max_positions, 10)]
+        df = pd.DataFrame({
+            "trading_pair": top_pairs,
+            "basis_after_fees": [basis[trading_pair] for trading_pair in top_pairs],
+            "active": [trading_pair in self.processed_data["current_pnl"] for trading_pair in top_pairs],
+            "current_pnl": [self.processed_data["current_pnl"].get(trading_pair) for trading_pair in top_pairs],
+        })
+        return [f"Min profitability: {self.config.profitability} | Active arbitrages: "
+                f"{len(self.processed_data['active_pairs'])}/{self.config.max_positions}",
+                format_df_for_printout(df, table_format="psql")]
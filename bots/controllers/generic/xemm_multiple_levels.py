@@ -5,6 +5,7 @@ from typing import Dict, List, Set
 import pandas as pd
 from pydantic import Field, validator
 
+from controllers.executor_index import ExecutorIndex
 from hummingbot.client.config.config_data_types import ClientFieldData
 from hummingbot.client.ui.interface_utils import format_df_for_printout
 from hummingbot.core.data_type.common import PriceType, TradeType
@@ -13,6 +14,7 @@ from hummingbot.strategy_v2.controllers.controller_base import ControllerBase, C
 from hummingbot.strategy_v2.executors.data_types import ConnectorPair
 from hummingbot.strategy_v2.executors.xemm_executor.data_types import XEMMExecutorConfig
 from hummingbot.strategy_v2.models.executor_actions import CreateExecutorAction, ExecutorAction
+from hummingbot.strategy_v2.models.executors_info import ExecutorInfo
 
 
 class XEMMMultipleLevelsConfig(ControllerConfigBase):
@@ -95,35 +97,34 @@ class XEMMMultipleLevels(ControllerBase):
         self.config = config
         self.buy_levels_targets_amount = config.buy_levels_targets_amount
         self.sell_levels_targets_amount = config.sell_levels_targets_amount
+        self.imbalance = 0
+        self.executor_index = ExecutorIndex(keys={"maker_side_target": self._executor_side_target},
+                                            on_done=self._update_imbalance)
         super().__init__(config, *args, **kwargs)
 
+    @staticmethod
+    def _executor_side_target(executor: ExecutorInfo):
+        return executor.config.maker_side, executor.config.target_profitability
+
+    def _update_imbalance(self, executor: ExecutorInfo):
+        """
+        Counts each executor that finished with a fill once, adding the buys and subtracting the sells.
+        """
+        if executor.filled_amount_quote != 0:
+            self.imbalance += 1 if executor.config.maker_side == TradeType.BUY else -1
+
     async def update_processed_data(self):
         pass
 
     def determine_executor_actions(self) -> List[ExecutorAction]:
         executor_actions = []
         mid_price = self.market_data_provider.get_price_by_type(self.config.maker_connector, self.config.maker_trading_pair, PriceType.MidPrice)
-        active_buy_executors = self.filter_executors(
-            executors=self.executors_info,
-            filter_func=lambda e: not e.is_done and e.config.maker_side == TradeType.BUY
-        )
-        active_sell_executors = self.filter_executors(
-            executors=self.executors_info,
-            filter_func=lambda e: not e.is_done and e.config.maker_side == TradeType.SELL
-        )
-        stopped_buy_executors = self.filter_executors(
-            executors=self.executors_info,
-            filter_func=lambda e: e.is_done and e.config.maker_side == TradeType.BUY and e.filled_amount_quote != 0
-        )
-        stopped_sell_executors = self.filter_executors(
-            executors=self.executors_info,
-            filter_func=lambda e: e.is_done and e.config.maker_side == TradeType.SELL and e.filled_amount_quote != 0
-        )
-        imbalance = len(stopped_buy_executors) - len(stopped_sell_executors)
+        self.executor_index.update(self.executors_info)
+        imbalance = self.imbalance
         for target_profitability, amount in self.buy_levels_targets_amount:
-            active_buy_executors_target = [e.config.target_profitability == target_profitability for e in active_buy_executors]
-
-            if len(active_buy_executors_target) == 0 and imbalance < self.config.max_executors_imbalance:
+            active_buy_executors_target = self.executor_index.count_by_key("maker_side_target",
+                                                                          (TradeType.BUY, target_profitability))
+            if active_buy_executors_target == 0 and imbalance < self.config.max_executors_imbalance:
                 config = XEMMExecutorConfig(
                     controller_id=self.config.id,
                     timestamp=self.market_data_provider.time(),
@@ -139,8 +140,9 @@ class XEMMMultipleLevels(ControllerBase):
                 )
                 executor_actions.append(CreateExecutorAction(executor_config=config, controller_id=self.config.id))
         for target_profitability, amount in self.sell_levels_targets_amount:
-            active_sell_executors_target = [e.config.target_profitability == target_profitability for e in active_sell_executors]
-            if len(active_sell_executors_target) == 0 and imbalance > -self.config.max_executors_imbalance:
+            active_sell_executors_target = self.executor_index.count_by_key("maker_side_target",
+                                                                           (TradeType.SELL, target_profitability))
+            if active_sell_executors_target == 0 and imbalance > -self.config.max_executors_imbalance:
                 config = XEMMExecutorConfig(
                     controller_id=self.config.id,
                     timestamp=time.time(),
@@ -0,0 +1,30 @@
+from typing import Dict, Hashable, Tuple, Type
+
+from controllers.streaming_indicators import StreamingIndicator
+
+_shared_indicators: Dict[Tuple[Hashable, ...], StreamingIndicator] = {}
+
+
+def get_shared_indicator(connector_name: str, trading_pair: str, interval: str,
+                         indicator_class: Type[StreamingIndicator], max_history: int = 1000,
+                         **params) -> StreamingIndicator:
+    """
+    Returns the streaming indicator shared by all the controllers of the bot that read the same candles feed with the
+    same parameters. Updating it with a window whose last candle was already processed is a no-op, so the indicator is
+    computed once per candle update however many controllers consume it.
+    :param connector_name: connector of the candles feed.
+    :param trading_pair: trading pair of the candles feed.
+    :param interval: interval of the candles feed.
+    :param indicator_class: StreamingIndicator subclass to instantiate.
+    :param max_history: rows of history required by the caller, the shared history keeps the largest one requested.
+    :param params: parameters of the indicator.
+    """
+    key = (connector_name, trading_pair, interval, indicator_class.__name__,
+           tuple(sorted((name, repr(value)) for name, value in params.items())))
+    indicator = _shared_indicators.get(key)
+    if indicator is None:
+        indicator = indicator_class(max_history=max_history, **params)
+        _shared_indicators[key] = indicator
+    else:
+        indicator.ensure_history(max_history)
+    return indicator
@@ -0,0 +1,317 @@
+from typing import Tuple
+
+import numpy as np
+import pandas as pd
+
+try:
+    from numba import njit
+    NUMBA_ENABLED = True
+except ImportError:  # numba is optional, without it the recursions run through pandas ewm/rolling or on Python lists
+    NUMBA_ENABLED = False
+
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+BBANDS_CHUNK_SIZE = 1 << 16
+
+
+def as_float_array(values) -> np.ndarray:
+    return np.ascontiguousarray(values, dtype=np.float64)
+
+
+def bbands(close, length: int = 20, std: float = 2.0) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray,
+                                                                np.ndarray]:
+    """
+    Same output as pandas_ta.bbands (population standard deviation).
+    :return: lower band, mid band, upper band, bandwidth and percent.
+    """
+    close = as_float_array(close)
+    mid = np.full(len(close), np.nan)
+    deviation = np.full(len(close), np.nan)
+    if len(close) >= length:
+        windows = np.lib.stride_tricks.sliding_window_view(close, length)
+        rows_per_chunk = max(BBANDS_CHUNK_SIZE // length, 1)
+        for start in range(0, len(windows), rows_per_chunk):
+            chunk = windows[start:start + rows_per_chunk]
+            mid[length - 1 + start:length - 1 + start + len(chunk)] = chunk.mean(axis=1)
+            deviation[length - 1 + start:length - 1 + start + len(chunk)] = chunk.std(axis=1)
+    deviation *= std
+    lower = mid - deviation
+    upper = mid + deviation
+    width = upper - lower
+    with np.errstate(divide="ignore", invalid="ignore"):
+        bandwidth = 100 * width / mid
+        percent = np.where(width != 0, (close - lower) / width, np.nan)
+    return lower, mid, upper, bandwidth, percent
+
+
+def bbands_percent_2d(closes, length: int = 20, std: float = 2.0) -> np.ndarray:
+    """
+    Bollinger Bands percent of several series at once, one row per series, with the same output as the percent of
+    bbands. Rows with missing closes in a window get NaN for it.
+    :return: array with one row per series and one column per window of length closes.
+    """
+    closes = np.asarray(closes, dtype=np.float64)
+    if closes.shape[1] < length:
+        return np.full((len(closes), 0), np.nan)
+    windows = np.lib.stride_tricks.sliding_window_view(closes, length, axis=1)
+    mid = windows.mean(axis=2)
+    deviation = std * windows.std(axis=2)
+    lower = mid - deviation
+    width = 2 * deviation
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(width != 0, (closes[:, length - 1:] - lower) / width, np.nan)
+
+
+@njit(cache=True)
+def _ema_loop(values, alpha, start, seed):
+    out = np.full(len(values), np.nan)
+    out[start] = seed
+    for i in range(start + 1, len(values)):
+        out[i] = out[i - 1] + alpha * (values[i] - out[i - 1])
+    return out
+
+
+def ema(values, length: int) -> np.ndarray:
+    """
+    Same output as pandas_ta.ema: seeded with the mean of the first length values (skipping missing ones) and
+    recursive afterwards.
+    """
+    values = as_float_array(values)
+    if len(values) < length:
+        return np.full(len(values), np.nan)
+    head = values[:length]
+    head = head[~np.isnan(head)]
+    seed = head.mean() if len(head) else np.nan
+    if NUMBA_ENABLED:
+        return _ema_loop(values, 2 / (length + 1), length - 1, seed)
+    out = np.full(len(values), np.nan)
+    tail = values[length - 1:].copy()
+    tail[0] = seed
+    # the recursion propagates a missing value to the rest of the series, so ewm only runs up to the first one
+    gaps = np.flatnonzero(np.isnan(tail))
+    end = gaps[0] if len(gaps) else len(tail)
+    out[length - 1:length - 1 + end] = pd.Series(tail[:end]).ewm(alpha=2 / (length + 1), adjust=False).mean()
+    return out
+
+
+def macd(close, fast: int = 12, slow: int = 26, signal: int = 9) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Same output as pandas_ta.macd.
+    :return: MACD line, histogram and signal line.
+    """
+    if slow < fast:
+        fast, slow = slow, fast
+    close = as_float_array(close)
+    macd_line = ema(close, fast) - ema(close, slow)
+    signal_line = np.full(len(close), np.nan)
+    valid = np.flatnonzero(~np.isnan(macd_line))
+    if len(valid):
+        signal_line[valid[0]:] = ema(macd_line[valid[0]:], signal)
+    return macd_line, macd_line - signal_line, signal_line
+
+
+def true_range(high, low, close) -> np.ndarray:
+    high, low, close = as_float_array(high), as_float_array(low), as_float_array(close)
+    prev_close = np.empty(len(close))
+    prev_close[:1] = np.nan
+    prev_close[1:] = close[:-1]
+    ranges = np.maximum(high - low, np.maximum(np.abs(high - prev_close), np.abs(low - prev_close)))
+    ranges[:1] = np.nan
+    return ranges
+
+
+def natr(high, low, close, length: int = 14) -> np.ndarray:
+    """
+    Same output as pandas_ta.natr (EMA of the true range as a percentage of the close).
+    """
+    close = as_float_array(close)
+    return 100 * ema(true_range(high, low, close), length) / close
+
+
+@njit(cache=True)
+def _ewm_adjusted_loop(values, decay):
+    out = np.full(len(values), np.nan)
+    numerator = 0.0
+    denominator = 0.0
+    started = False
+    for i in range(len(values)):
+        if not np.isnan(values[i]):
+            numerator = values[i] + decay * numerator
+            denominator = 1.0 + decay * denominator
+            started = True
+        elif started:
+            numerator *= decay
+            denominator *= decay
+        if started:
+            out[i] = numerator / denominator
+    return out
+
+
+def rma(values, length: int) -> np.ndarray:
+    """
+    Same output as pandas_ta.rma (pandas ewm with alpha=1/length, adjust=True and min_periods=length).
+    """
+    values = as_float_array(values)
+    if NUMBA_ENABLED:
+        out = _ewm_adjusted_loop(values, 1 - 1 / length)
+    else:
+        out = pd.Series(values).ewm(alpha=1 / length, adjust=True).mean().to_numpy(copy=True)
+    out[np.cumsum(~np.isnan(values)) < length] = np.nan
+    return out
+
+
+@njit(cache=True)
+def _rolling_zscore_loop(values, window):
+    out = np.full(len(values), np.nan)
+    count = 0
+    mean = 0.0
+    m2 = 0.0
+    for i in range(len(values)):
+        x = values[i]
+        if not np.isnan(x):
+            count += 1
+            delta = x - mean
+            mean += delta / count
+            m2 += delta * (x - mean)
+        if i >= window and not np.isnan(values[i - window]):
+            oldest = values[i - window]
+            count -= 1
+            if count == 0:
+                mean = 0.0
+                m2 = 0.0
+            else:
+                delta = oldest - mean
+                mean -= delta / count
+                m2 -= delta * (oldest - mean)
+        if count > 1 and m2 > 0 and not np.isnan(x):
+            out[i] = (x - mean) / np.sqrt(m2 / (count - 1))
+    return out
+
+
+def rolling_zscore(values, window: int) -> np.ndarray:
+    """
+    Z-score of each value against the mean and sample standard deviation of the last window values (skipping missing
+    ones), kept with Welford updates. It is NaN while fewer than two values are available or the window is constant.
+    """
+    values = as_float_array(values)
+    if NUMBA_ENABLED:
+        return _rolling_zscore_loop(values, window)
+    rolling = pd.Series(values).rolling(window, min_periods=2)
+    mean = rolling.mean().to_numpy()
+    std = rolling.std().to_numpy()
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(std > 0, (values - mean) / std, np.nan)
+
+
+@njit(cache=True)
+def _supertrend_loop(close, upper, lower, direction, trend, long, short):
+    for i in range(1, len(close)):
+        if close[i] > upper[i - 1]:
+            direction[i] = 1
+        elif close[i] < lower[i - 1]:
+            direction[i] = -1
+        else:
+            direction[i] = direction[i - 1]
+            if direction[i] > 0 and lower[i] < lower[i - 1]:
+                lower[i] = lower[i - 1]
+            if direction[i] < 0 and upper[i] > upper[i - 1]:
+                upper[i] = upper[i - 1]
+        if direction[i] > 0:
+            trend[i] = lower[i]
+            long[i] = lower[i]
+        else:
+            trend[i] = upper[i]
+            short[i] = upper[i]
+
+
+def supertrend(high, low, close, length: int = 7, multiplier: float = 3.0) -> Tuple[np.ndarray, np.ndarray,
+                                                                                     np.ndarray, np.ndarray]:
+    """
+    Same output as pandas_ta.supertrend.
+    :return: trend, direction, long and short lines.
+    """
+    trend, direction, long, short, _, _ = supertrend_bands(high, low, close, length, multiplier)
+    return trend, direction, long, short
+
+
+def supertrend_bands(high, low, close, length: int = 7, multiplier: float = 3.0):
+    """
+    Like supertrend, also returning the upper and lower bands after the adjustments of the loop.
+    """
+    high, low, close = as_float_array(high), as_float_array(low), as_float_array(close)
+    band = multiplier * rma(true_range(high, low, close), length)
+    hl2 = (high + low) / 2
+    upper = hl2 + band
+    lower = hl2 - band
+    n = len(close)
+    outputs = (upper, lower, np.ones(n), np.zeros(n), np.full(n, np.nan), np.full(n, np.nan))
+    if NUMBA_ENABLED:
+        _supertrend_loop(close, *outputs)
+    else:
+        # indexing lists is several times faster than indexing arrays from Python
+        buffers = [values.tolist() for values in outputs]
+        _supertrend_loop(close.tolist(), *buffers)
+        outputs = tuple(np.array(values) for values in buffers)
+    upper, lower, direction, trend, long, short = outputs
+    return trend, direction, long, short, upper, lower
+
+
+@njit(cache=True)
+def _kalman_filter_loop(values, initial_mean, initial_covariance, observation_covariance, transition_covariance, mean,
+                        covariance):
+    predicted_mean = initial_mean
+    predicted_covariance = initial_covariance
+    for i in range(len(values)):
+        if i > 0:
+            predicted_mean = mean[i - 1]
+            predicted_covariance = covariance[i - 1] + transition_covariance
+        gain = predicted_covariance / (predicted_covariance + observation_covariance)
+        mean[i] = predicted_mean + gain * (values[i] - predicted_mean)
+        covariance[i] = predicted_covariance * (1 - gain)
+
+
+def kalman_filter(values, initial_mean: float, initial_covariance: float = 0.001, observation_covariance: float = 1.0,
+                  transition_covariance: float = 0.001) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Same output as pykalman.KalmanFilter.filter for a random walk observed with noise (scalar state, transition and
+    observation matrices of 1): the first value is filtered from the initial state without a transition.
+    :return: filtered state means and covariances.
+    """
+    values = as_float_array(values)
+    if NUMBA_ENABLED:
+        mean = np.empty(len(values))
+        covariance = np.empty(len(values))
+        _kalman_filter_loop(values, initial_mean, initial_covariance, observation_covariance, transition_covariance,
+                            mean, covariance)
+        return mean, covariance
+    # the covariances do not depend on the values and reach a steady state, after which the filter is an ewm of the
+    # values with the steady gain
+    covariance = np.empty(len(values))
+    gains = np.empty(len(values))
+    predicted_covariance = initial_covariance
+    steady = len(values)
+    for i in range(len(values)):
+        if i > 0:
+            predicted_covariance = covariance[i - 1] + transition_covariance
+        gains[i] = predicted_covariance / (predicted_covariance + observation_covariance)
+        covariance[i] = predicted_covariance * (1 - gains[i])
+        if i > 0 and covariance[i] == covariance[i - 1]:
+            steady = i
+            break
+    mean = np.empty(len(values))
+    previous_mean = initial_mean
+    for i in range(steady):
+        mean[i] = previous_mean + gains[i] * (values[i] - previous_mean)
+        previous_mean = mean[i]
+    if steady < len(values):
+        covariance[steady:] = covariance[steady]
+        series = values[steady - 1:].copy()
+        series[0] = mean[steady - 1]
+        gaps = np.flatnonzero(np.isnan(series))
+        end = gaps[0] if len(gaps) else len(series)
+        mean[steady:] = np.nan
+        mean[steady:steady - 1 + end] = pd.Series(series[:end]).ewm(alpha=gains[steady], adjust=False).mean()[1:]
+    return mean, covariance
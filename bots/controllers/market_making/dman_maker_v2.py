@@ -4,6 +4,7 @@ from typing import List, Optional
 import pandas_ta as ta  # noqa: F401
 from pydantic import Field, validator
 
+from controllers.executor_index import ExecutorIndex
 from hummingbot.client.config.config_data_types import ClientFieldData
 from hummingbot.core.data_type.common import TradeType
 from hummingbot.data_feed.candles_feed.data_types import CandlesConfig
@@ -94,6 +95,7 @@ class DManMakerV2(MarketMakingControllerBase):
         self.config = config
         self.dca_amounts_pct = [Decimal(amount) / sum(self.config.dca_amounts) for amount in self.config.dca_amounts]
         self.spreads = self.config.dca_spreads
+        self.executor_index = ExecutorIndex()
 
     def first_level_refresh_condition(self, executor):
         if self.config.top_executor_refresh_time is not None:
@@ -105,9 +107,9 @@ class DManMakerV2(MarketMakingControllerBase):
         return self.market_data_provider.time() - executor.timestamp > self.config.executor_refresh_time * 1000
 
     def executors_to_refresh(self) -> List[ExecutorAction]:
-        executors_to_refresh = self.filter_executors(
-            executors=self.executors_info,
-            filter_func=lambda x: not x.is_trading and x.is_active and (self.order_level_refresh_condition(x) or self.first_level_refresh_condition(x)))
+        self.executor_index.update(self.executors_info)
+        executors_to_refresh = [executor for executor in self.executor_index.placed_executors()
+                                if self.order_level_refresh_condition(executor) or self.first_level_refresh_condition(executor)]
         return [StopExecutorAction(
             controller_id=self.config.id,
             executor_id=executor.id) for executor in executors_to_refresh]
@@ -1,9 +1,12 @@
 from decimal import Decimal
 from typing import List
 
-import pandas_ta as ta  # noqa: F401
 from pydantic import Field, validator
 
+from controllers.candles import get_shared_candles
+from controllers.features import FeaturesRetention, features_rows, retain_features
+from controllers.indicator_cache import get_shared_indicator
+from controllers.streaming_indicators import StreamingMACD, StreamingNATR, StreamingZScore
 from hummingbot.client.config.config_data_types import ClientFieldData
 from hummingbot.data_feed.candles_feed.data_types import CandlesConfig
 from hummingbot.strategy_v2.controllers.market_making_controller_base import (
@@ -66,6 +69,18 @@ class PMMDynamicControllerConfig(MarketMakingControllerConfigBase):
         client_data=ClientFieldData(
             prompt=lambda mi: "Enter the NATR length: ",
             prompt_on_new=True))
+    features_retention: FeaturesRetention = Field(
+        default=FeaturesRetention.FULL,
+        client_data=ClientFieldData(
+            is_updatable=True,
+            prompt=lambda mi: "Enter the features retention (full/last_rows/signal_columns/compact): ",
+            prompt_on_new=False))
+    features_max_rows: int = Field(
+        default=100,
+        client_data=ClientFieldData(
+            is_updatable=True,
+            prompt=lambda mi: "Enter the number of feature rows to keep with last_rows or compact retention: ",
+            prompt_on_new=False))
 
     @validator("candles_connector", pre=True, always=True)
     def set_candles_connector(cls, v, values):
@@ -95,30 +110,50 @@ class PMMDynamicController(MarketMakingControllerBase):
                 interval=config.interval,
                 max_records=self.max_records
             )]
+        self.natr = get_shared_indicator(config.candles_connector, config.candles_trading_pair, config.interval,
+                                         StreamingNATR, max_history=self.max_records,
+                                         length=config.natr_length)
+        self.macd = get_shared_indicator(config.candles_connector, config.candles_trading_pair, config.interval,
+                                         StreamingMACD, max_history=self.max_records,
+                                         fast=config.macd_fast, slow=config.macd_slow, signal=config.macd_signal)
+        self.macd_zscore = StreamingZScore(self.max_records, max_history=self.max_records)
+        self.candles = get_shared_candles(self.config.candles_config[0])
         super().__init__(config, *args, **kwargs)
 
     async def update_processed_data(self):
-        candles = self.market_data_provider.get_candles_df(connector_name=self.config.candles_connector,
-                                                           trading_pair=self.config.candles_trading_pair,
-                                                           interval=self.config.interval,
-                                                           max_records=self.max_records)
-        natr = ta.natr(candles["high"], candles["low"], candles["close"], length=self.config.natr_length) / 100
-        macd_output = ta.macd(candles["close"], fast=self.config.macd_fast,
-                              slow=self.config.macd_slow, signal=self.config.macd_signal)
-        macd = macd_output[f"MACD_{self.config.macd_fast}_{self.config.macd_slow}_{self.config.macd_signal}"]
-        macd_signal = - (macd - macd.mean()) / macd.std()
-        macdh = macd_output[f"MACDh_{self.config.macd_fast}_{self.config.macd_slow}_{self.config.macd_signal}"]
-        macdh_signal = macdh.apply(lambda x: 1 if x > 0 else -1)
-        max_price_shift = natr / 2
-        price_multiplier = ((0.5 * macd_signal + 0.5 * macdh_signal) * max_price_shift).iloc[-1]
-        candles["spread_multiplier"] = natr
-        candles["reference_price"] = candles["close"] * (1 + price_multiplier)
+        self.candles.sync_feed(self.market_data_provider.get_candles_feed(self.config.candles_config[0]))
+        candles = self.candles.view(self.max_records)
+        self.natr.update(candles)
+        self.macd.update(candles)
+        macd = self.macd.values(len(candles))
+        self.macd_zscore.update({"timestamp": candles["timestamp"], "value": macd[:, 0]})
+        macd_signal = - self.macd_zscore.last[f"ZS_{self.max_records}"]
+        macdh_signal = 1 if macd[-1, 1] > 0 else -1
+        spread_multiplier = self.natr.last[f"NATR_{self.config.natr_length}"] / 100
+        max_price_shift = spread_multiplier / 2
+        price_multiplier = (0.5 * macd_signal + 0.5 * macdh_signal) * max_price_shift
         self.processed_data = {
-            "reference_price": Decimal(candles["reference_price"].iloc[-1]),
-            "spread_multiplier": Decimal(candles["spread_multiplier"].iloc[-1]),
-            "features": candles
+            "reference_price": Decimal(candles["close"][-1] * (1 + price_multiplier)),
+            "spread_multiplier": Decimal(spread_multiplier),
+            "features": self.get_features(price_multiplier),
         }
 
+    def get_features(self, price_multiplier: float):
+        """
+        Builds the features DataFrame with only the candles kept by the features retention.
+        """
+        features = self.candles.to_frame(features_rows(self.config.features_retention, self.config.features_max_rows,
+                                                       self.max_records))
+        self.natr.append_columns(features)
+        self.macd.append_columns(features)
+        features["spread_multiplier"] = features[f"NATR_{self.config.natr_length}"] / 100
+        features["reference_price"] = features["close"] * (1 + price_multiplier)
+        return retain_features(
+            features, self.config.features_retention, self.config.features_max_rows,
+            ["close", f"MACD_{self.config.macd_fast}_{self.config.macd_slow}_{self.config.macd_signal}",
+             f"MACDh_{self.config.macd_fast}_{self.config.macd_slow}_{self.config.macd_signal}",
+             "spread_multiplier", "reference_price"])
+
     def get_executor_config(self, level_id: str, price: Decimal, amount: Decimal):
         trade_type = self.get_trade_type_from_level_id(level_id)
         return PositionExecutorConfig(
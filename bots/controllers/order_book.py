@@ -0,0 +1,151 @@
+from itertools import islice
+from typing import Dict, Optional, Tuple, Union
+
+import numpy as np
+
+from hummingbot.core.data_type.order_book import OrderBook
+
+DEFAULT_MAX_DEPTH = 100
+
+
+class OrderBookSide:
+    """
+    Prices and cumulative base and quote amounts of one side of the book, best price first.
+    """
+    def __init__(self, prices: np.ndarray, amounts: np.ndarray):
+        self.prices = prices
+        self.amounts = amounts
+        self.cumulative_base = np.cumsum(amounts)
+        self.cumulative_quote = np.cumsum(prices * amounts)
+
+    def __len__(self):
+        return len(self.prices)
+
+    def price_for_volume(self, volume, quote: bool = False):
+        """
+        Price of the level where the cumulative volume reaches the volume, as OrderBook.get_price_for_volume and
+        get_price_for_quote_volume return. It is NaN when the side does not have enough depth.
+        """
+        cumulative = self.cumulative_quote if quote else self.cumulative_base
+        positions = np.searchsorted(cumulative, volume, side="left")
+        prices = np.append(self.prices, np.nan)
+        return prices[positions]
+
+    def vwap_for_volume(self, volume, quote: bool = False):
+        """
+        Average price of filling the volume walking the side from the best price. It is NaN when the side does not
+        have enough depth.
+        """
+        volume = np.asarray(volume, dtype=float)
+        cumulative = self.cumulative_quote if quote else self.cumulative_base
+        positions = np.searchsorted(cumulative, volume, side="left")
+        prices = np.append(self.prices, np.nan)[positions]
+        previous_base = np.append(0.0, self.cumulative_base)[positions]
+        previous_quote = np.append(0.0, self.cumulative_quote)[positions]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            if quote:
+                base = previous_base + (volume - previous_quote) / prices
+                return volume / base
+            quote_volume = previous_quote + (volume - previous_base) * prices
+            return quote_volume / volume
+
+
+class OrderBookMirror:
+    """
+    NumPy copy of the top max_depth levels of an order book with cumulative amounts per side. Syncing only compares the
+    snapshot and diff uids of the book; the arrays are rebuilt on the first query after a change, walking the best
+    max_depth entries of each side, and every depth query is a binary search over them, so a controller can evaluate
+    many sizes per tick. Volumes deeper than max_depth levels are reported as not enough depth.
+    """
+    def __init__(self, max_depth: int = DEFAULT_MAX_DEPTH):
+        self.max_depth = max_depth
+        self._order_book: Optional[OrderBook] = None
+        self._uid: Optional[Tuple[int, int]] = None
+        self._stale = False
+        self._bids = OrderBookSide(np.empty(0), np.empty(0))
+        self._asks = OrderBookSide(np.empty(0), np.empty(0))
+
+    def ensure_depth(self, max_depth: int):
+        if max_depth > self.max_depth:
+            self.max_depth = max_depth
+            self._stale = self._order_book is not None
+
+    def sync(self, order_book: OrderBook) -> bool:
+        """
+        Marks the sides to be rebuilt if the book changed since the last sync.
+        :return: True if the book changed.
+        """
+        uid = (order_book.snapshot_uid, order_book.last_diff_uid)
+        if uid == self._uid and order_book is self._order_book:
+            return False
+        self._order_book = order_book
+        self._uid = uid
+        self._stale = True
+        return True
+
+    def _rebuild(self):
+        if self._stale:
+            self._bids = self._side(self._order_book.bid_entries())
+            self._asks = self._side(self._order_book.ask_entries())
+            self._stale = False
+
+    def _side(self, entries) -> OrderBookSide:
+        levels = np.array([(row.price, row.amount) for row in islice(entries, self.max_depth)], dtype=float)
+        if len(levels) == 0:
+            return OrderBookSide(np.empty(0), np.empty(0))
+        return OrderBookSide(levels[:, 0], levels[:, 1])
+
+    @property
+    def bids(self) -> OrderBookSide:
+        self._rebuild()
+        return self._bids
+
+    @property
+    def asks(self) -> OrderBookSide:
+        self._rebuild()
+        return self._asks
+
+    @property
+    def best_bid(self) -> float:
+        return self.bids.prices[0] if len(self.bids) else np.nan
+
+    @property
+    def best_ask(self) -> float:
+        return self.asks.prices[0] if len(self.asks) else np.nan
+
+    @property
+    def mid_price(self) -> float:
+        return (self.best_bid + self.best_ask) / 2
+
+    def price_for_quote_volume(self, is_buy: bool, quote_volume: Union[float, np.ndarray]):
+        return (self.asks if is_buy else self.bids).price_for_volume(quote_volume, quote=True)
+
+    def price_for_volume(self, is_buy: bool, volume: Union[float, np.ndarray]):
+        return (self.asks if is_buy else self.bids).price_for_volume(volume)
+
+    def vwap_for_quote_volume(self, is_buy: bool, quote_volume: Union[float, np.ndarray]):
+        return (self.asks if is_buy else self.bids).vwap_for_volume(quote_volume, quote=True)
+
+    def vwap_for_volume(self, is_buy: bool, volume: Union[float, np.ndarray]):
+        return (self.asks if is_buy else self.bids).vwap_for_volume(volume)
+
+
+_shared_order_books: Dict[Tuple[str, str], OrderBookMirror] = {}
+
+
+def get_shared_order_book(market_data_provider, connector_name: str, trading_pair: str,
+                          max_depth: int = DEFAULT_MAX_DEPTH) -> OrderBookMirror:
+    """
+    Returns the order book mirror shared by all the controllers of the bot for the connector and trading pair, synced
+    with the current book. Syncing again a book that did not change is a uid comparison. Its depth is the largest
+    max_depth requested.
+    """
+    key = (connector_name, trading_pair)
+    order_book = _shared_order_books.get(key)
+    if order_book is None:
+        order_book = OrderBookMirror(max_depth)
+        _shared_order_books[key] = order_book
+    else:
+        order_book.ensure_depth(max_depth)
+    order_book.sync(market_data_provider.get_order_book(connector_name, trading_pair))
+    return order_book
@@ -0,0 +1,108 @@
+"""
+Keyframe and delta messages for the performance reports that v2_with_controllers publishes on the performance/delta
+MQTT topic. The module only uses the standard library, plus msgpack for packed messages, so a consumer of the topic
+can import it without hummingbot.
+"""
+import base64
+from decimal import Decimal
+from typing import Any, Dict, Optional
+
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:  # msgpack is optional, without it the performance messages are published as JSON
+    msgpack = None
+    MSGPACK_AVAILABLE = False
+
+
+def unpack(message: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Returns the message as sent by PerformanceDeltaEncoder.encode, unpacking it if it was packed with msgpack.
+    """
+    if message.get("encoding") == "msgpack":
+        return msgpack.unpackb(base64.b64decode(message["data"]), strict_map_key=False)
+    return message
+
+
+class PerformanceDeltaEncoder:
+    """
+    Encodes the performance reports published every interval as keyframes with all the reports, sent every
+    keyframe_interval seconds, and deltas in between with only the controllers and the fields of their reports that
+    changed since the previous message. encode returns None when nothing changed. Messages are numbered, so a
+    consumer that misses one waits for the next keyframe (see PerformanceStateAssembler). With use_msgpack the
+    message is packed with msgpack and carried base64 encoded, since the MQTT publisher only sends JSON.
+    """
+    def __init__(self, keyframe_interval: float, use_msgpack: bool = False):
+        self.keyframe_interval = keyframe_interval
+        self.use_msgpack = use_msgpack
+        self._reports: Dict[str, dict] = {}
+        self._last_keyframe_timestamp: Optional[float] = None
+        self._seq = 0
+
+    def request_keyframe(self):
+        self._last_keyframe_timestamp = None
+
+    def encode(self, reports: Dict[str, dict], timestamp: float, keyframe: bool = False) -> Optional[Dict[str, Any]]:
+        if keyframe or self._last_keyframe_timestamp is None or \
+                timestamp - self._last_keyframe_timestamp >= self.keyframe_interval:
+            message = {"type": "keyframe", "seq": self._seq, "timestamp": timestamp, "reports": reports}
+            self._last_keyframe_timestamp = timestamp
+        else:
+            changed = {}
+            for controller_id, report in reports.items():
+                previous = self._reports.get(controller_id)
+                if report is previous:
+                    continue
+                if previous is None:
+                    changed[controller_id] = report
+                    continue
+                fields = {key: value for key, value in report.items() if key not in previous or previous[key] != value}
+                if fields:
+                    changed[controller_id] = fields
+            removed = [controller_id for controller_id in self._reports if controller_id not in reports]
+            if not changed and not removed:
+                return None
+            message = {"type": "delta", "seq": self._seq, "timestamp": timestamp, "changed": changed,
+                       "removed": removed}
+        self._reports = reports
+        self._seq += 1
+        return self.pack(message) if self.use_msgpack else message
+
+    @staticmethod
+    def _msgpack_default(obj):
+        if isinstance(obj, Decimal):
+            return float(obj)
+        return str(obj)
+
+    @classmethod
+    def pack(cls, message: Dict[str, Any]) -> Dict[str, Any]:
+        data = msgpack.packb(message, default=cls._msgpack_default)
+        return {"encoding": "msgpack", "data": base64.b64encode(data).decode()}
+
+
+class PerformanceStateAssembler:
+    """
+    Rebuilds the performance reports of a bot from the messages of PerformanceDeltaEncoder. Deltas that do not follow
+    the last applied message are ignored until the next keyframe.
+    """
+    def __init__(self):
+        self.reports: Dict[str, dict] = {}
+        self._seq: Optional[int] = None
+
+    def apply(self, message: Dict[str, Any]) -> bool:
+        """
+        :return: True if the message was applied and the reports are up to date.
+        """
+        message = unpack(message)
+        if message["type"] == "keyframe":
+            self.reports = {controller_id: dict(report) for controller_id, report in message["reports"].items()}
+        elif self._seq is None or message["seq"] != self._seq + 1:
+            self._seq = None
+            return False
+        else:
+            for controller_id, fields in message["changed"].items():
+                self.reports.setdefault(controller_id, {}).update(fields)
+            for controller_id in message["removed"]:
+                self.reports.pop(controller_id, None)
+        self._seq = message["seq"]
+        return True
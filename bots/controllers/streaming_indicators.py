@@ -0,0 +1,685 @@
+import math
+from collections import deque
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from controllers import indicators
+
+
+class HistoryBuffer:
+    """
+    Fixed capacity buffer of rows backed by an array twice as large as the capacity, so appending is amortized O(1)
+    and the most recent rows are always available as a contiguous view. Rows are float64 vectors of the given width,
+    or records of a structured dtype when width is None.
+    """
+    def __init__(self, capacity: int, width: Optional[int] = None, dtype=np.float64):
+        self.capacity = max(capacity, 1)
+        self._row_shape = () if width is None else (width,)
+        self._data = np.full((2 * self.capacity,) + self._row_shape, np.nan, dtype=dtype)
+        self._end = 0
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def clear(self):
+        self._end = 0
+        self._size = 0
+
+    def ensure_capacity(self, capacity: int):
+        if capacity <= self.capacity:
+            return
+        data = np.full((2 * capacity,) + self._row_shape, np.nan, dtype=self._data.dtype)
+        data[:self._size] = self._data[self._end - self._size:self._end]
+        self._data = data
+        self._end = self._size
+        self.capacity = capacity
+
+    def append(self, row: Tuple[float, ...]):
+        if self._end == len(self._data):
+            keep = self.capacity - 1
+            self._data[:keep] = self._data[self._end - keep:self._end]
+            self._end = keep
+            self._size = min(self._size, keep)
+        self._data[self._end] = row
+        self._end += 1
+        self._size = min(self._size + 1, self.capacity)
+
+    def load(self, rows: np.ndarray):
+        rows = rows[len(rows) - min(len(rows), self.capacity):]
+        self._data[:len(rows)] = rows
+        self._end = len(rows)
+        self._size = len(rows)
+
+    def set_last(self, row: Tuple[float, ...]):
+        self._data[self._end - 1] = row
+
+    def last(self):
+        return self._data[self._end - 1] if self._size else None
+
+    def tail(self, n: int) -> np.ndarray:
+        n = min(n, self._size)
+        return self._data[self._end - n:self._end]
+
+
+class StreamingIndicator:
+    """
+    Base class for indicators that are advanced one candle at a time instead of being recomputed over the whole candles
+    window on every tick.
+
+    The last candle of the window is treated as still forming: its output is computed from the state committed up to
+    the previous candle, so a revision of the last candle costs one step and a new candle commits the pending state
+    before computing the next one. When the window no longer contains the last candle seen (first call, gaps in the
+    feed or a shorter history than the window) the state is rebuilt from the whole window, using the NumPy kernels of
+    controllers.indicators when the subclass provides a _seed for them.
+    """
+    inputs: Tuple[str, ...] = ("close",)
+    columns: Tuple[str, ...] = ()
+
+    def __init__(self, max_history: int = 1000):
+        self.max_history = max_history
+        self._history = HistoryBuffer(max_history, len(self.columns))
+        self._last_timestamp: Optional[float] = None
+        self._last_inputs: Optional[Tuple[float, ...]] = None
+        self._reset_state()
+
+    def _reset_state(self):
+        raise NotImplementedError
+
+    def _compute(self, row: Tuple[float, ...]) -> Tuple[float, ...]:
+        """
+        Computes the output for the forming candle from the committed state and stores what is needed to commit it.
+        """
+        raise NotImplementedError
+
+    def _commit(self):
+        """
+        Applies the pending state of the forming candle once a newer candle is received.
+        """
+        raise NotImplementedError
+
+    def _seed(self, inputs) -> np.ndarray:
+        """
+        Commits the state for the given closed candles and returns their outputs, one row per candle.
+        """
+        outputs = np.empty((len(inputs[0]), len(self.columns)))
+        for i in range(len(inputs[0])):
+            outputs[i] = self._compute(tuple(float(values[i]) for values in inputs))
+            self._commit()
+        return outputs
+
+    def ensure_history(self, max_history: int):
+        if max_history > self.max_history:
+            self.max_history = max_history
+            self._history.ensure_capacity(max_history)
+
+    def update(self, candles, append: bool = False):
+        """
+        Synchronizes the indicator with the candles window.
+        :param candles: DataFrame (or any object indexable by column name) with a timestamp column and the inputs.
+        :param append: if True the indicator columns are added to the candles, as pandas_ta does with append=True.
+        """
+        n_candles = len(candles)
+        if n_candles == 0:
+            return
+        timestamps = np.asarray(candles["timestamp"])
+        inputs = [np.asarray(candles[name], dtype=float) for name in self.inputs]
+        start = self._find_last_timestamp(timestamps)
+        if start is None or len(self._history) < min(start + 1, self._history.capacity):
+            self._reset(inputs)
+        else:
+            self._advance(start, inputs)
+        self._last_timestamp = timestamps[-1]
+        if append:
+            self.append_columns(candles)
+
+    def _find_last_timestamp(self, timestamps: np.ndarray) -> Optional[int]:
+        if self._last_timestamp is None or timestamps[-1] < self._last_timestamp:
+            return None
+        if timestamps[-1] == self._last_timestamp:
+            return len(timestamps) - 1
+        position = int(np.searchsorted(timestamps, self._last_timestamp))
+        if position < len(timestamps) and timestamps[position] == self._last_timestamp:
+            return position
+        return None
+
+    def _reset(self, inputs):
+        self._reset_state()
+        self._history.load(self._seed([values[:-1] for values in inputs]))
+        self._last_inputs = tuple(float(values[-1]) for values in inputs)
+        self._history.append(self._compute(self._last_inputs))
+
+    def _advance(self, start: int, inputs):
+        row = tuple(float(values[start]) for values in inputs)
+        if row != self._last_inputs:
+            self._last_inputs = row
+            self._history.set_last(self._compute(row))
+        for i in range(start + 1, len(inputs[0])):
+            self._commit()
+            self._last_inputs = tuple(float(values[i]) for values in inputs)
+            self._history.append(self._compute(self._last_inputs))
+
+    def append_columns(self, candles):
+        n_candles = len(candles)
+        values = self._history.tail(n_candles)
+        if len(values) < n_candles:
+            values = np.vstack([np.full((n_candles - len(values), len(self.columns)), np.nan), values])
+        for i, column in enumerate(self.columns):
+            candles[column] = values[:, i]
+
+    @property
+    def last(self) -> Dict[str, float]:
+        values = self._history.tail(1)
+        if len(values) == 0:
+            return {column: math.nan for column in self.columns}
+        return dict(zip(self.columns, values[0]))
+
+    def what_if(self, **inputs: float) -> Dict[str, float]:
+        """
+        Returns the output of the forming candle if it had the given inputs, leaving the state untouched.
+        """
+        if self._last_inputs is None:
+            return {column: math.nan for column in self.columns}
+        row = tuple(float(inputs.get(name, value)) for name, value in zip(self.inputs, self._last_inputs))
+        output = self._compute(row)
+        self._compute(self._last_inputs)
+        return dict(zip(self.columns, output))
+
+    def values(self, n: int) -> np.ndarray:
+        """
+        Returns a read-only view of the last n rows of the indicator, one column per name in columns.
+        """
+        values = self._history.tail(n)
+        values.flags.writeable = False
+        return values
+
+
+class StreamingBollingerBands(StreamingIndicator):
+    """
+    Bollinger Bands with the same output as pandas_ta.bbands (population standard deviation). The window of closes is
+    kept with running sums shifted by a reference close, which are recomputed from the window every length candles to
+    bound the rounding drift.
+    """
+    inputs = ("close",)
+
+    def __init__(self, length: int = 20, std: float = 2.0, max_history: int = 1000):
+        self.length = length
+        self.std = std
+        props = f"_{length}_{std}"
+        self.columns = (f"BBL{props}", f"BBM{props}", f"BBU{props}", f"BBB{props}", f"BBP{props}")
+        super().__init__(max_history)
+
+    def _reset_state(self):
+        self._window = deque()
+        self._shift = None
+        self._sum = 0.0
+        self._sum_sq = 0.0
+        self._commits = 0
+        self._pending = math.nan
+
+    def _compute(self, row):
+        close = row[0]
+        self._pending = close
+        n = len(self._window) + 1
+        if n < self.length:
+            return (math.nan,) * 5
+        shift = close if self._shift is None else self._shift
+        delta = close - shift
+        mean_delta = (self._sum + delta) / n
+        variance = max((self._sum_sq + delta * delta) / n - mean_delta * mean_delta, 0.0)
+        mid = shift + mean_delta
+        deviation = self.std * math.sqrt(variance)
+        lower = mid - deviation
+        upper = mid + deviation
+        width = upper - lower
+        bandwidth = 100 * width / mid if mid else math.nan
+        percent = (close - lower) / width if width else math.nan
+        return lower, mid, upper, bandwidth, percent
+
+    def _commit(self):
+        if self._shift is None:
+            self._shift = self._pending
+        delta = self._pending - self._shift
+        self._window.append(delta)
+        self._sum += delta
+        self._sum_sq += delta * delta
+        if len(self._window) >= self.length:
+            oldest = self._window.popleft()
+            self._sum -= oldest
+            self._sum_sq -= oldest * oldest
+        self._commits += 1
+        if self._commits % self.length == 0:
+            self._rebase()
+
+    def _seed(self, inputs):
+        closes = inputs[0]
+        if len(closes) == 0:
+            return np.empty((0, len(self.columns)))
+        self._shift = float(closes[-1])
+        window = closes[len(closes) - min(len(closes), self.length - 1):]
+        self._window = deque(float(close) - self._shift for close in window)
+        self._sum = math.fsum(self._window)
+        self._sum_sq = math.fsum(delta * delta for delta in self._window)
+        return np.column_stack(indicators.bbands(closes, self.length, self.std))
+
+    def _rebase(self):
+        closes = [delta + self._shift for delta in self._window]
+        self._shift = closes[-1] if closes else self._pending
+        self._window = deque(close - self._shift for close in closes)
+        self._sum = math.fsum(self._window)
+        self._sum_sq = math.fsum(delta * delta for delta in self._window)
+
+
+class EMAState:
+    """
+    Exponential moving average seeded with the mean of the first length values, as pandas_ta.ema does. Missing values
+    inside the seed window are skipped for the mean, like pandas does.
+    """
+    def __init__(self, length: int):
+        self.length = length
+        self.alpha = 2 / (length + 1)
+        self.reset()
+
+    def reset(self):
+        self.count = 0
+        self.value = math.nan
+        self._seed_sum = 0.0
+        self._seed_count = 0
+        self._pending = (math.nan, math.nan)
+
+    def compute(self, x: float) -> float:
+        count = self.count + 1
+        if count < self.length:
+            value = math.nan
+        elif count == self.length:
+            seed_sum = self._seed_sum + (0.0 if math.isnan(x) else x)
+            seed_count = self._seed_count + (0 if math.isnan(x) else 1)
+            value = seed_sum / seed_count if seed_count else math.nan
+        else:
+            value = self.value + self.alpha * (x - self.value)
+        self._pending = (x, value)
+        return value
+
+    def seed(self, values: np.ndarray, ema_values: np.ndarray):
+        """
+        Sets the state as if the values had been committed one by one, given their EMA computed in batch.
+        """
+        self.reset()
+        self.count = len(values)
+        head = values[:self.length]
+        head = head[~np.isnan(head)]
+        self._seed_sum = float(head.sum())
+        self._seed_count = len(head)
+        if len(values):
+            self.value = float(ema_values[-1])
+
+    def commit(self):
+        x, value = self._pending
+        self.count += 1
+        if self.count <= self.length and not math.isnan(x):
+            self._seed_sum += x
+            self._seed_count += 1
+        self.value = value
+
+
+class StreamingMACD(StreamingIndicator):
+    """
+    MACD with the same output as pandas_ta.macd: the signal line is an EMA of the MACD line starting at its first
+    valid value.
+    """
+    inputs = ("close",)
+
+    def __init__(self, fast: int = 12, slow: int = 26, signal: int = 9, max_history: int = 1000):
+        if slow < fast:
+            fast, slow = slow, fast
+        self.fast = fast
+        self.slow = slow
+        self.signal = signal
+        props = f"_{fast}_{slow}_{signal}"
+        self.columns = (f"MACD{props}", f"MACDh{props}", f"MACDs{props}")
+        super().__init__(max_history)
+
+    def _reset_state(self):
+        self._fast_ema = EMAState(self.fast)
+        self._slow_ema = EMAState(self.slow)
+        self._signal_ema = EMAState(self.signal)
+        self._signal_pending = False
+
+    def _compute(self, row):
+        close = row[0]
+        macd = self._fast_ema.compute(close) - self._slow_ema.compute(close)
+        self._signal_pending = not math.isnan(macd)
+        signal = self._signal_ema.compute(macd) if self._signal_pending else math.nan
+        return macd, macd - signal, signal
+
+    def _seed(self, inputs):
+        close = inputs[0]
+        fast = indicators.ema(close, self.fast)
+        slow = indicators.ema(close, self.slow)
+        self._fast_ema.seed(close, fast)
+        self._slow_ema.seed(close, slow)
+        macd = fast - slow
+        signal = np.full(len(close), np.nan)
+        valid = np.flatnonzero(~np.isnan(macd))
+        if len(valid):
+            signal[valid[0]:] = indicators.ema(macd[valid[0]:], self.signal)
+            self._signal_ema.seed(macd[valid[0]:], signal[valid[0]:])
+        return np.column_stack((macd, macd - signal, signal))
+
+    def _commit(self):
+        self._fast_ema.commit()
+        self._slow_ema.commit()
+        if self._signal_pending:
+            self._signal_ema.commit()
+
+
+class StreamingNATR(StreamingIndicator):
+    """
+    Normalized ATR with the same output as pandas_ta.natr: the EMA of the true range expressed as a percentage of the
+    close.
+    """
+    inputs = ("high", "low", "close")
+
+    def __init__(self, length: int = 14, max_history: int = 1000):
+        self.length = length
+        self.columns = (f"NATR_{length}",)
+        super().__init__(max_history)
+
+    def _reset_state(self):
+        self._atr = EMAState(self.length)
+        self._prev_close = math.nan
+        self._pending = math.nan
+
+    def _compute(self, row):
+        high, low, close = row
+        self._pending = close
+        if math.isnan(self._prev_close):
+            true_range = math.nan
+        else:
+            true_range = max(high - low, abs(high - self._prev_close), abs(low - self._prev_close))
+        return 100 * self._atr.compute(true_range) / close,
+
+    def _seed(self, inputs):
+        high, low, close = inputs
+        true_range = indicators.true_range(high, low, close)
+        atr = indicators.ema(true_range, self.length)
+        self._atr.seed(true_range, atr)
+        if len(close):
+            self._prev_close = float(close[-1])
+        return (100 * atr / close).reshape(-1, 1)
+
+    def _commit(self):
+        self._atr.commit()
+        self._prev_close = self._pending
+
+
+class RMAState:
+    """
+    Wilder's moving average with the same output as pandas_ta.rma, i.e. pandas ewm with alpha=1/length, adjust=True
+    and min_periods=length.
+    """
+    def __init__(self, length: int):
+        self.length = length
+        self.decay = 1 - 1 / length
+        self.reset()
+
+    def reset(self):
+        self.numerator = 0.0
+        self.denominator = 0.0
+        self.count = 0
+        self._pending = (0.0, 0.0, 0)
+
+    def compute(self, x: float) -> float:
+        numerator, denominator, count = self.numerator, self.denominator, self.count
+        if not math.isnan(x):
+            numerator = x + self.decay * numerator
+            denominator = 1 + self.decay * denominator
+            count += 1
+        elif count:
+            numerator *= self.decay
+            denominator *= self.decay
+        self._pending = (numerator, denominator, count)
+        return numerator / denominator if count >= self.length else math.nan
+
+    def seed(self, values: np.ndarray):
+        """
+        Sets the state as if the values had been committed one by one.
+        """
+        self.reset()
+        valid = ~np.isnan(values)
+        self.count = int(valid.sum())
+        if self.count:
+            weights = self.decay ** np.arange(len(values) - 1, -1, -1, dtype=float)[valid]
+            self.numerator = float(np.dot(weights, values[valid]))
+            self.denominator = float(weights.sum())
+
+    def commit(self):
+        self.numerator, self.denominator, self.count = self._pending
+
+
+class RollingZScoreState:
+    """
+    Mean and sample variance of the last window values kept with Welford updates, adding the newest value and removing
+    the one leaving the window. Missing values take a place in the window but are not counted, as pandas does. The
+    statistics are recomputed from the window every window commits to bound the rounding drift.
+    """
+    def __init__(self, window: int):
+        self.window = window
+        self.reset()
+
+    def reset(self):
+        self._values = deque()
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self._commits = 0
+        self._pending = math.nan
+
+    @staticmethod
+    def _add(count: int, mean: float, m2: float, x: float) -> Tuple[int, float, float]:
+        count += 1
+        delta = x - mean
+        mean += delta / count
+        return count, mean, m2 + delta * (x - mean)
+
+    @staticmethod
+    def _remove(count: int, mean: float, m2: float, x: float) -> Tuple[int, float, float]:
+        count -= 1
+        if count == 0:
+            return 0, 0.0, 0.0
+        delta = x - mean
+        mean -= delta / count
+        return count, mean, m2 - delta * (x - mean)
+
+    def compute(self, x: float) -> float:
+        """
+        Returns the z-score of x against the committed window extended with x.
+        """
+        self._pending = x
+        if math.isnan(x):
+            return math.nan
+        count, mean, m2 = self._add(self.count, self.mean, self.m2, x)
+        if count < 2 or m2 <= 0:
+            return math.nan
+        return (x - mean) / math.sqrt(m2 / (count - 1))
+
+    def seed(self, values: np.ndarray):
+        """
+        Sets the state as if the values had been committed one by one.
+        """
+        self.reset()
+        self._values = deque(float(x) for x in values[len(values) - min(len(values), self.window - 1):])
+        self._recompute()
+
+    def commit(self):
+        x = self._pending
+        self._values.append(x)
+        if not math.isnan(x):
+            self.count, self.mean, self.m2 = self._add(self.count, self.mean, self.m2, x)
+        if len(self._values) > self.window - 1:
+            oldest = self._values.popleft()
+            if not math.isnan(oldest):
+                self.count, self.mean, self.m2 = self._remove(self.count, self.mean, self.m2, oldest)
+        self._commits += 1
+        if self._commits % self.window == 0:
+            self._recompute()
+
+    def _recompute(self):
+        valid = np.array([x for x in self._values if not math.isnan(x)])
+        self.count = len(valid)
+        self.mean = float(valid.mean()) if self.count else 0.0
+        self.m2 = float(((valid - self.mean) ** 2).sum()) if self.count else 0.0
+
+
+class StreamingZScore(StreamingIndicator):
+    """
+    Rolling z-score of a series over the last length rows. It is fed with a mapping holding the timestamps and the
+    values of the series, usually a column of another streaming indicator.
+    """
+    inputs = ("value",)
+
+    def __init__(self, length: int = 200, max_history: int = 1000):
+        self.length = length
+        self.columns = (f"ZS_{length}",)
+        super().__init__(max_history)
+
+    def _reset_state(self):
+        self._zscore = RollingZScoreState(self.length)
+
+    def _compute(self, row):
+        return self._zscore.compute(row[0]),
+
+    def _seed(self, inputs):
+        values = inputs[0]
+        self._zscore.seed(values)
+        return indicators.rolling_zscore(values, self.length).reshape(-1, 1)
+
+    def _commit(self):
+        self._zscore.commit()
+
+
+class StreamingSuperTrend(StreamingIndicator):
+    """
+    SuperTrend with the same output as pandas_ta.supertrend. The ATR, the bands adjusted by the previous candles and
+    the direction are carried forward, so each candle is a single step of the pandas_ta loop.
+    """
+    inputs = ("high", "low", "close")
+
+    def __init__(self, length: int = 7, multiplier: float = 3.0, max_history: int = 1000):
+        self.length = length
+        self.multiplier = multiplier
+        props = f"_{length}_{multiplier}"
+        self.columns = (f"SUPERT{props}", f"SUPERTd{props}", f"SUPERTl{props}", f"SUPERTs{props}")
+        super().__init__(max_history)
+
+    def _reset_state(self):
+        self._atr = RMAState(self.length)
+        self._prev_close = math.nan
+        self._upper = math.nan
+        self._lower = math.nan
+        self._direction = 1
+        self._started = False
+        self._pending = (math.nan, math.nan, math.nan, 1)
+
+    def _compute(self, row):
+        high, low, close = row
+        if math.isnan(self._prev_close):
+            true_range = math.nan
+        else:
+            true_range = max(high - low, abs(high - self._prev_close), abs(low - self._prev_close))
+        band = self.multiplier * self._atr.compute(true_range)
+        hl2 = (high + low) / 2
+        upper = hl2 + band
+        lower = hl2 - band
+        if not self._started:
+            direction = 1
+            trend, long, short = 0.0, math.nan, math.nan
+        else:
+            if close > self._upper:
+                direction = 1
+            elif close < self._lower:
+                direction = -1
+            else:
+                direction = self._direction
+                if direction > 0 and lower < self._lower:
+                    lower = self._lower
+                if direction < 0 and upper > self._upper:
+                    upper = self._upper
+            if direction > 0:
+                trend, long, short = lower, lower, math.nan
+            else:
+                trend, long, short = upper, math.nan, upper
+        self._pending = (close, upper, lower, direction)
+        return trend, direction, long, short
+
+    def _seed(self, inputs):
+        high, low, close = inputs
+        if len(close) == 0:
+            return np.empty((0, len(self.columns)))
+        trend, direction, long, short, upper, lower = indicators.supertrend_bands(high, low, close, self.length,
+                                                                                  self.multiplier)
+        self._atr.seed(indicators.true_range(high, low, close))
+        self._prev_close = float(close[-1])
+        self._upper = float(upper[-1])
+        self._lower = float(lower[-1])
+        self._direction = int(direction[-1])
+        self._started = True
+        return np.column_stack((trend, direction, long, short))
+
+    def _commit(self):
+        self._atr.commit()
+        self._prev_close, self._upper, self._lower, self._direction = self._pending
+        self._started = True
+
+
+class StreamingKalmanFilter(StreamingIndicator):
+    """
+    Kalman filter of the close as a random walk observed with noise, with the same output as pykalman starting at the
+    first close of the history (initial_state_mean) and bands at 1.96 times the state covariance around the filtered
+    mean. Each candle is one scalar predict and update step.
+    """
+    inputs = ("close",)
+    columns = ("kf", "kf_upper", "kf_lower")
+
+    def __init__(self, observation_covariance: float = 1.0, transition_covariance: float = 0.001,
+                 initial_state_covariance: float = 0.001, max_history: int = 1000):
+        self.observation_covariance = observation_covariance
+        self.transition_covariance = transition_covariance
+        self.initial_state_covariance = initial_state_covariance
+        super().__init__(max_history)
+
+    def _reset_state(self):
+        self._mean = math.nan
+        self._covariance = math.nan
+        self._started = False
+        self._pending = (math.nan, math.nan)
+
+    def _compute(self, row):
+        close = row[0]
+        if self._started:
+            predicted_mean = self._mean
+            predicted_covariance = self._covariance + self.transition_covariance
+        else:
+            predicted_mean = close
+            predicted_covariance = self.initial_state_covariance
+        gain = predicted_covariance / (predicted_covariance + self.observation_covariance)
+        mean = predicted_mean + gain * (close - predicted_mean)
+        covariance = predicted_covariance * (1 - gain)
+        self._pending = (mean, covariance)
+        return mean, mean + 1.96 * covariance, mean - 1.96 * covariance
+
+    def _seed(self, inputs):
+        close = inputs[0]
+        if len(close) == 0:
+            return np.empty((0, len(self.columns)))
+        mean, covariance = indicators.kalman_filter(close, float(close[0]), self.initial_state_covariance,
+                                                    self.observation_covariance, self.transition_covariance)
+        self._mean = float(mean[-1])
+        self._covariance = float(covariance[-1])
+        self._started = True
+        return np.column_stack((mean, mean + 1.96 * covariance, mean - 1.96 * covariance))
+
+    def _commit(self):
+        self._mean, self._covariance = self._pending
+        self._started = True
@@ -1,19 +1,27 @@
+import asyncio
+import logging
 import os
+import threading
 import time
+from collections import OrderedDict
 from decimal import Decimal
-from typing import Dict, List, Optional, Set
+from typing import Any, Dict, List, NamedTuple, Optional, Set, Tuple
 
-from pydantic import Field
+from pydantic import BaseModel, Field
 
+from controllers.performance_messages import MSGPACK_AVAILABLE, PerformanceDeltaEncoder
 from hummingbot.client.hummingbot_application import HummingbotApplication
 from hummingbot.connector.connector_base import ConnectorBase
 from hummingbot.core.clock import Clock
-from hummingbot.core.data_type.common import OrderType, TradeType
+from hummingbot.core.data_type.common import OrderType, PriceType, TradeType
 from hummingbot.data_feed.candles_feed.data_types import CandlesConfig
 from hummingbot.remote_iface.mqtt import ETopicPublisher
 from hummingbot.strategy.strategy_v2_base import StrategyV2Base, StrategyV2ConfigBase
+from hummingbot.strategy_v2.executors.executor_orchestrator import ExecutorOrchestrator
 from hummingbot.strategy_v2.models.base import RunnableStatus
 from hummingbot.strategy_v2.models.executor_actions import CreateExecutorAction, StopExecutorAction
+from hummingbot.strategy_v2.models.executors import CloseType
+from hummingbot.strategy_v2.models.executors_info import ExecutorInfo
 
 
 class GenericV2StrategyWithCashOutConfig(StrategyV2ConfigBase):
@@ -24,12 +32,198 @@ class GenericV2StrategyWithCashOutConfig(StrategyV2ConfigBase):
     max_global_drawdown: Optional[float] = None
     max_controller_drawdown: Optional[float] = None
     performance_report_interval: int = 1
+    performance_report_deltas: bool = False
+    performance_report_keyframe_interval: int = 60
+    performance_report_msgpack: bool = False
     rebalance_interval: Optional[int] = None
     extra_inventory: Optional[float] = 0.02
     min_amount_to_rebalance_usd: Decimal = Decimal("8")
     asset_to_rebalance: str = "USDT"
 
 
+class RebalanceOrder(NamedTuple):
+    trading_pair: str
+    side: TradeType
+    amount: Decimal
+    price: Decimal
+
+
+class ControllerPnl:
+    """
+    Running PnL of the executors and the held positions of a controller. The net PnL of each executor is added to the
+    realized PnL once, when it is first seen finished, and its id is remembered so the finished executors are skipped
+    afterwards; executors closed with a position hold are skipped, since their fills are counted in the position. The
+    unrealized PnL is the sum over the active executors and the held positions of the tick. seed aligns the PnL with
+    the performance report of the orchestrator, which also includes the executors stored in the database. The
+    high-water mark of the global PnL is kept alongside, so the drawdown is a subtraction.
+    """
+    def __init__(self):
+        self.base_pnl_quote = Decimal("0")
+        self.realized_pnl_quote = Decimal("0")
+        self.unrealized_pnl_quote = Decimal("0")
+        self.max_global_pnl_quote = Decimal("0")
+        self._done_ids: Set[str] = set()
+        self._active_state: tuple = ()
+        self._positions_pnl_quote = Decimal("0")
+
+    @property
+    def global_pnl_quote(self) -> Decimal:
+        return self.base_pnl_quote + self.realized_pnl_quote + self.unrealized_pnl_quote
+
+    @property
+    def drawdown_quote(self) -> Decimal:
+        return self.max_global_pnl_quote - self.global_pnl_quote
+
+    def seed(self, report_global_pnl_quote: Decimal):
+        """
+        Sets the base PnL so the global PnL matches the global PnL of a performance report generated for the same
+        executors and positions as the last update, usually at startup.
+        """
+        self.base_pnl_quote += report_global_pnl_quote - self.global_pnl_quote
+        self.max_global_pnl_quote = max(self.max_global_pnl_quote, self.global_pnl_quote)
+
+    def update(self, executors: List[ExecutorInfo], positions_pnl_quote: Decimal = Decimal("0")) -> bool:
+        """
+        Adds the executors that finished since the last update and recomputes the unrealized PnL with the global PnL
+        of the held positions.
+        :return: True if any executor finished, the state or PnL of an active executor changed or the PnL of the held
+        positions changed.
+        """
+        changed = False
+        unrealized_pnl_quote = positions_pnl_quote
+        active_state = []
+        for executor in executors:
+            if executor.id in self._done_ids:
+                continue
+            if executor.is_active:
+                unrealized_pnl_quote += executor.net_pnl_quote
+                active_state.append((executor.id, executor.status, executor.filled_amount_quote,
+                                     executor.net_pnl_quote))
+            else:
+                self._done_ids.add(executor.id)
+                if executor.close_type != CloseType.POSITION_HOLD:
+                    self.realized_pnl_quote += executor.net_pnl_quote
+                changed = True
+        active_state = tuple(active_state)
+        changed = changed or active_state != self._active_state or positions_pnl_quote != self._positions_pnl_quote
+        self._active_state = active_state
+        self._positions_pnl_quote = positions_pnl_quote
+        self.unrealized_pnl_quote = unrealized_pnl_quote
+        self.max_global_pnl_quote = max(self.max_global_pnl_quote, self.global_pnl_quote)
+        return changed
+
+
+class PerformanceReports:
+    """
+    Performance reports of the controllers, generated by the executor orchestrator only when they are read and only
+    for the controllers invalidated since their last report. The reports are kept as pydantic models and converted
+    to dictionaries only when they are published.
+    """
+    def __init__(self, executor_orchestrator: ExecutorOrchestrator):
+        self.executor_orchestrator = executor_orchestrator
+        self._reports: Dict[str, BaseModel] = {}
+        self._dicts: Dict[str, dict] = {}
+
+    def invalidate(self, controller_id: str):
+        self._reports.pop(controller_id, None)
+        self._dicts.pop(controller_id, None)
+
+    def report(self, controller_id: str) -> BaseModel:
+        report = self._reports.get(controller_id)
+        if report is None:
+            report = self.executor_orchestrator.generate_performance_report(controller_id=controller_id)
+            self._reports[controller_id] = report
+        return report
+
+    def to_dict(self, controller_ids) -> Dict[str, dict]:
+        """
+        Returns the reports as dictionaries. The dictionary of a controller is the same object until the controller is
+        invalidated, so the reports that did not change can be compared by identity.
+        """
+        reports = {}
+        for controller_id in controller_ids:
+            report_dict = self._dicts.get(controller_id)
+            if report_dict is None:
+                report_dict = self.report(controller_id).dict()
+                self._dicts[controller_id] = report_dict
+            reports[controller_id] = report_dict
+        return reports
+
+
+class BackgroundPublisher:
+    """
+    Publishes MQTT messages from a background thread so the strategy tick never waits for the broker. Pending
+    messages are kept per topic and only the latest one of each topic is sent (the older one is coalesced). At most
+    max_pending topics wait at the same time, and beyond that the oldest pending message is dropped. The counters of
+    published, coalesced, dropped and failed messages are exposed by metrics.
+    """
+    def __init__(self, max_pending: int = 16):
+        self.max_pending = max_pending
+        self.published = 0
+        self.coalesced = 0
+        self.dropped = 0
+        self.errors = 0
+        self._publishers: Dict[str, ETopicPublisher] = {}
+        self._pending: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._condition = threading.Condition()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="mqtt-background-publisher", daemon=True)
+        self._thread.start()
+
+    def add_topic(self, topic: str, use_bot_prefix: bool = True):
+        self._publishers[topic] = ETopicPublisher(topic, use_bot_prefix=use_bot_prefix)
+
+    def publish(self, topic: str, message: Dict[str, Any]) -> bool:
+        """
+        Queues the message without blocking.
+        :return: False if a pending message of the topic was replaced or the message could not be queued.
+        """
+        with self._condition:
+            if self._closed:
+                self.dropped += 1
+                return False
+            delivered = True
+            if topic in self._pending:
+                del self._pending[topic]
+                self.coalesced += 1
+                delivered = False
+            elif len(self._pending) >= self.max_pending:
+                self._pending.popitem(last=False)
+                self.dropped += 1
+            self._pending[topic] = message
+            self._condition.notify()
+            return delivered
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._pending and not self._closed:
+                    self._condition.wait()
+                if not self._pending:
+                    return
+                topic, message = self._pending.popitem(last=False)
+            try:
+                self._publishers[topic](message)
+                self.published += 1
+            except Exception:
+                self.errors += 1
+                logging.getLogger(__name__).exception(f"Error publishing to the MQTT topic {topic}.")
+
+    def stop(self, timeout: float = 5):
+        """
+        Sends the pending messages and stops the thread, waiting at most timeout seconds.
+        """
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        self._thread.join(timeout)
+
+    def metrics(self) -> Dict[str, int]:
+        with self._condition:
+            return {"published": self.published, "coalesced": self.coalesced, "dropped": self.dropped,
+                    "errors": self.errors, "pending": len(self._pending)}
+
+
 class GenericV2StrategyWithCashOut(StrategyV2Base):
     """
     This script runs a generic strategy with cash out feature. Will also check if the controllers configs have been
@@ -45,8 +239,8 @@ class GenericV2StrategyWithCashOut(StrategyV2Base):
         super().__init__(connectors, config)
         self.config = config
         self.cashing_out = False
-        self.max_pnl_by_controller = {}
-        self.performance_reports = {}
+        self.pnl_by_controller: Dict[str, ControllerPnl] = {}
+        self.performance_reports = PerformanceReports(self.executor_orchestrator)
         self.max_global_pnl = Decimal("0")
         self.drawdown_exited_controllers = []
         self.closed_executors_buffer: int = 30
@@ -56,7 +250,15 @@ class GenericV2StrategyWithCashOut(StrategyV2Base):
         self._last_rebalance_check_timestamp = 0
         hb_app = HummingbotApplication.main_application()
         self.mqtt_enabled = hb_app._mqtt is not None
-        self._pub: Optional[ETopicPublisher] = None
+        self._publisher: Optional[BackgroundPublisher] = None
+        self._performance_topic = "performance"
+        self.performance_encoder: Optional[PerformanceDeltaEncoder] = None
+        if self.config.performance_report_deltas:
+            use_msgpack = self.config.performance_report_msgpack and MSGPACK_AVAILABLE
+            if self.config.performance_report_msgpack and not use_msgpack:
+                self.logger().warning("msgpack is not installed, publishing the performance deltas as JSON.")
+            self.performance_encoder = PerformanceDeltaEncoder(self.config.performance_report_keyframe_interval,
+                                                               use_msgpack)
         if self.config.time_to_cash_out:
             self.cash_out_time = self.config.time_to_cash_out + time.time()
         else:
@@ -71,80 +273,143 @@ class GenericV2StrategyWithCashOut(StrategyV2Base):
         self._last_timestamp = timestamp
         self.apply_initial_setting()
         if self.mqtt_enabled:
-            self._pub = ETopicPublisher("performance", use_bot_prefix=True)
+            # the deltas go to their own topic so the consumers of the full reports are not affected
+            self._performance_topic = "performance/delta" if self.performance_encoder else "performance"
+            self._publisher = BackgroundPublisher()
+            self._publisher.add_topic(self._performance_topic)
 
     async def on_stop(self):
         await super().on_stop()
-        if self.mqtt_enabled:
-            self._pub({controller_id: {} for controller_id in self.controllers.keys()})
-            self._pub = None
+        if self._publisher is not None:
+            self.publish_performance_reports({controller_id: {} for controller_id in self.controllers.keys()},
+                                             keyframe=True)
+            publisher = self._publisher
+            self._publisher = None
+            await asyncio.get_running_loop().run_in_executor(None, publisher.stop)
+            self.logger().info(f"MQTT publisher metrics: {publisher.metrics()}")
 
     def on_tick(self):
         super().on_tick()
-        self.performance_reports = {controller_id: self.executor_orchestrator.generate_performance_report(controller_id=controller_id).dict() for controller_id in self.controllers.keys()}
+        self.update_pnl()
         self.control_rebalance()
         self.control_cash_out()
         self.control_max_drawdown()
         self.send_performance_report()
 
+    def update_pnl(self):
+        for controller_id, executors in self.executors_info.items():
+            if controller_id not in self.pnl_by_controller:
+                self.pnl_by_controller[controller_id] = self.create_controller_pnl(controller_id)
+            if self.pnl_by_controller[controller_id].update(executors, self.get_positions_pnl_quote(controller_id)):
+                self.performance_reports.invalidate(controller_id)
+
+    def create_controller_pnl(self, controller_id: str) -> ControllerPnl:
+        """
+        Returns the running PnL of the controller seeded from its performance report, so it includes the performance
+        loaded from the database and the positions held, as the published global_pnl_quote does.
+        """
+        controller_pnl = ControllerPnl()
+        controller_pnl.update(self.executors_info.get(controller_id, []), self.get_positions_pnl_quote(controller_id))
+        self.performance_reports.invalidate(controller_id)
+        controller_pnl.seed(self.performance_reports.report(controller_id).global_pnl_quote)
+        return controller_pnl
+
+    def get_positions_pnl_quote(self, controller_id: str) -> Decimal:
+        """
+        Returns the global PnL of the positions held by the controller at the current mid prices.
+        """
+        positions_pnl_quote = Decimal("0")
+        for position in self.executor_orchestrator.positions_held.get(controller_id, []):
+            mid_price = self.market_data_provider.get_price_by_type(position.connector_name, position.trading_pair,
+                                                                    PriceType.MidPrice)
+            positions_pnl_quote += position.get_position_summary(mid_price).global_pnl_quote
+        return positions_pnl_quote
+
     def control_rebalance(self):
         if self.rebalance_interval and self._last_rebalance_check_timestamp + self.rebalance_interval <= self.current_timestamp:
-            balance_required = {}
-            for controller_id, controller in self.controllers.items():
-                connector_name = controller.config.dict().get("connector_name")
-                if connector_name and "perpetual" in connector_name:
+            balance_required = self.get_balance_required()
+            executors_exposure = self.get_executors_exposure()
+            for connector_name, orders in self.plan_rebalance(balance_required, executors_exposure).items():
+                self.submit_rebalance_orders(connector_name, orders)
+            self._last_rebalance_check_timestamp = self.current_timestamp
+
+    def get_balance_required(self) -> Dict[str, Dict[str, Decimal]]:
+        """
+        Returns the amount of each token required by the spot controllers, by connector.
+        """
+        balance_required = {}
+        for controller in self.controllers.values():
+            connector_name = getattr(controller.config, "connector_name", None)
+            if connector_name is None or "perpetual" in connector_name:
+                continue
+            tokens_required = balance_required.setdefault(connector_name, {})
+            for token, amount in controller.get_balance_requirements():
+                tokens_required[token] = tokens_required.get(token, Decimal("0")) + amount
+        return balance_required
+
+    def get_executors_exposure(self) -> Dict[Tuple[str, str, TradeType], Decimal]:
+        """
+        Returns the filled amount quote of the active executors by connector, trading pair and side, in one pass over
+        the executors.
+        """
+        executors_exposure = {}
+        for executor in self.get_all_executors():
+            if executor.is_active:
+                key = (executor.connector_name, executor.trading_pair, executor.side)
+                executors_exposure[key] = executors_exposure.get(key, Decimal("0")) + executor.filled_amount_quote
+        return executors_exposure
+
+    def plan_rebalance(self, balance_required: Dict[str, Dict[str, Decimal]],
+                       executors_exposure: Dict[Tuple[str, str, TradeType], Decimal]) -> Dict[str, List[RebalanceOrder]]:
+        """
+        Computes the difference between the balance of each required token, including the unmatched amount of the
+        active executors, and the amount required plus the extra inventory, and returns the market orders that close
+        it grouped by connector.
+        """
+        orders = {}
+        for connector_name, balance_requirements in balance_required.items():
+            connector = self.connectors[connector_name]
+            for token, amount in balance_requirements.items():
+                if token == self.config.asset_to_rebalance:
                     continue
-                if connector_name not in balance_required:
-                    balance_required[connector_name] = {}
-                tokens_required = controller.get_balance_requirements()
-                for token, amount in tokens_required:
-                    if token not in balance_required[connector_name]:
-                        balance_required[connector_name][token] = amount
+                balance = connector.get_balance(token)
+                trading_pair = f"{token}-{self.config.asset_to_rebalance}"
+                mid_price = connector.get_mid_price(trading_pair)
+                trading_rule = connector.trading_rules[trading_pair]
+                amount_with_safe_margin = amount * (1 + Decimal(self.config.extra_inventory))
+                unmatched_amount = executors_exposure.get((connector_name, trading_pair, TradeType.SELL), Decimal("0")) - \
+                    executors_exposure.get((connector_name, trading_pair, TradeType.BUY), Decimal("0"))
+                balance += unmatched_amount / mid_price
+                base_balance_diff = balance - amount_with_safe_margin
+                abs_balance_diff = abs(base_balance_diff)
+                trading_rules_condition = abs_balance_diff > trading_rule.min_order_size and abs_balance_diff * mid_price > trading_rule.min_notional_size and abs_balance_diff * mid_price > self.config.min_amount_to_rebalance_usd
+                if base_balance_diff > 0:
+                    if trading_rules_condition:
+                        self.logger().debug(f"Rebalance: Selling {amount_with_safe_margin} {token} to {self.config.asset_to_rebalance}. Balance: {balance} | Executors unmatched balance {unmatched_amount / mid_price}")
+                        orders.setdefault(connector_name, []).append(
+                            RebalanceOrder(trading_pair, TradeType.SELL, abs_balance_diff, mid_price))
                     else:
-                        balance_required[connector_name][token] += amount
-            for connector_name, balance_requirements in balance_required.items():
-                connector = self.connectors[connector_name]
-                for token, amount in balance_requirements.items():
-                    if token == self.config.asset_to_rebalance:
-                        continue
-                    balance = connector.get_balance(token)
-                    trading_pair = f"{token}-{self.config.asset_to_rebalance}"
-                    mid_price = connector.get_mid_price(trading_pair)
-                    trading_rule = connector.trading_rules[trading_pair]
-                    amount_with_safe_margin = amount * (1 + Decimal(self.config.extra_inventory))
-                    active_executors_for_pair = self.filter_executors(
-                        executors=self.get_all_executors(),
-                        filter_func=lambda x: x.is_active and x.trading_pair == trading_pair and x.connector_name == connector_name
-                    )
-                    unmatched_amount = sum([executor.filled_amount_quote for executor in active_executors_for_pair if executor.side == TradeType.SELL]) - sum([executor.filled_amount_quote for executor in active_executors_for_pair if executor.side == TradeType.BUY])
-                    balance += unmatched_amount / mid_price
-                    base_balance_diff = balance - amount_with_safe_margin
-                    abs_balance_diff = abs(base_balance_diff)
-                    trading_rules_condition = abs_balance_diff > trading_rule.min_order_size and abs_balance_diff * mid_price > trading_rule.min_notional_size and abs_balance_diff * mid_price > self.config.min_amount_to_rebalance_usd
-                    order_type = OrderType.MARKET
-                    if base_balance_diff > 0:
-                        if trading_rules_condition:
-                            self.logger().debug(f"Rebalance: Selling {amount_with_safe_margin} {token} to {self.config.asset_to_rebalance}. Balance: {balance} | Executors unmatched balance {unmatched_amount / mid_price}")
-                            connector.sell(
-                                trading_pair=trading_pair,
-                                amount=abs_balance_diff,
-                                order_type=order_type,
-                                price=mid_price)
-                        else:
-                            self.logger().debug("Skipping rebalance due a low amount to sell that may cause future imbalance")
+                        self.logger().debug("Skipping rebalance due a low amount to sell that may cause future imbalance")
+                else:
+                    if not trading_rules_condition:
+                        amount = max([self.config.min_amount_to_rebalance_usd / mid_price, trading_rule.min_order_size, trading_rule.min_notional_size / mid_price])
+                        self.logger().debug(f"Rebalance: Buying for a higher value to avoid future imbalance {amount} {token} to {self.config.asset_to_rebalance}. Balance: {balance} | Executors unmatched balance {unmatched_amount}")
                     else:
-                        if not trading_rules_condition:
-                            amount = max([self.config.min_amount_to_rebalance_usd / mid_price, trading_rule.min_order_size, trading_rule.min_notional_size / mid_price])
-                            self.logger().debug(f"Rebalance: Buying for a higher value to avoid future imbalance {amount} {token} to {self.config.asset_to_rebalance}. Balance: {balance} | Executors unmatched balance {unmatched_amount}")
-                        else:
-                            amount = abs_balance_diff
-                            self.logger().debug(f"Rebalance: Buying {amount} {token} to {self.config.asset_to_rebalance}. Balance: {balance} | Executors unmatched balance {unmatched_amount}")
-                        connector.buy(
-                            trading_pair=trading_pair,
-                            amount=amount,
-                            order_type=order_type,
-                            price=mid_price)
-            self._last_rebalance_check_timestamp = self.current_timestamp
+                        amount = abs_balance_diff
+                        self.logger().debug(f"Rebalance: Buying {amount} {token} to {self.config.asset_to_rebalance}. Balance: {balance} | Executors unmatched balance {unmatched_amount}")
+                    orders.setdefault(connector_name, []).append(
+                        RebalanceOrder(trading_pair, TradeType.BUY, amount, mid_price))
+        return orders
+
+    def submit_rebalance_orders(self, connector_name: str, orders: List[RebalanceOrder]):
+        connector = self.connectors[connector_name]
+        for order in orders:
+            place_order = connector.buy if order.side == TradeType.BUY else connector.sell
+            place_order(
+                trading_pair=order.trading_pair,
+                amount=order.amount,
+                order_type=OrderType.MARKET,
+                price=order.price)
 
     def control_max_drawdown(self):
         if self.config.max_controller_drawdown:
@@ -154,26 +419,22 @@ class GenericV2StrategyWithCashOut(StrategyV2Base):
 
     def check_max_controller_drawdown(self):
         for controller_id, controller in self.controllers.items():
-            controller_pnl = self.performance_reports[controller_id]["global_pnl_quote"]
-            last_max_pnl = self.max_pnl_by_controller[controller_id]
-            if controller_pnl > last_max_pnl:
-                self.max_pnl_by_controller[controller_id] = controller_pnl
-            else:
-                current_drawdown = last_max_pnl - controller_pnl
-                if current_drawdown > self.config.max_controller_drawdown:
-                    self.logger().info(f"Controller {controller_id} reached max drawdown. Stopping the controller.")
-                    controller.stop()
-                    executors_order_placed = self.filter_executors(
-                        executors=self.executors_info[controller_id],
-                        filter_func=lambda x: x.is_active and not x.is_trading,
-                    )
-                    self.executor_orchestrator.execute_actions(
-                        actions=[StopExecutorAction(controller_id=controller_id, executor_id=executor.id) for executor in executors_order_placed]
-                    )
-                    self.drawdown_exited_controllers.append(controller_id)
+            controller_pnl = self.pnl_by_controller.get(controller_id)
+            if controller_pnl is not None and controller_pnl.drawdown_quote > self.config.max_controller_drawdown:
+                self.logger().info(f"Controller {controller_id} reached max drawdown. Stopping the controller.")
+                controller.stop()
+                executors_order_placed = self.filter_executors(
+                    executors=self.executors_info[controller_id],
+                    filter_func=lambda x: x.is_active and not x.is_trading,
+                )
+                self.executor_orchestrator.execute_actions(
+                    actions=[StopExecutorAction(controller_id=controller_id, executor_id=executor.id) for executor in executors_order_placed]
+                )
+                self.drawdown_exited_controllers.append(controller_id)
 
     def check_max_global_drawdown(self):
-        current_global_pnl = sum([report["global_pnl_quote"] for report in self.performance_reports.values()])
+        current_global_pnl = sum([self.pnl_by_controller[controller_id].global_pnl_quote
+                                  for controller_id in self.controllers.keys() if controller_id in self.pnl_by_controller])
         if current_global_pnl > self.max_global_pnl:
             self.max_global_pnl = current_global_pnl
         else:
@@ -184,10 +445,25 @@ class GenericV2StrategyWithCashOut(StrategyV2Base):
                 HummingbotApplication.main_application().stop()
 
     def send_performance_report(self):
-        if self.current_timestamp - self._last_performance_report_timestamp >= self.performance_report_interval and self.mqtt_enabled:
-            self._pub(self.performance_reports)
+        if self.current_timestamp - self._last_performance_report_timestamp >= self.performance_report_interval and self._publisher is not None:
+            self.publish_performance_reports(self.performance_reports.to_dict(self.controllers.keys()))
             self._last_performance_report_timestamp = self.current_timestamp
 
+    def publish_performance_reports(self, reports: Dict[str, dict], keyframe: bool = False):
+        if self.performance_encoder is None:
+            self._publisher.publish(self._performance_topic, reports)
+            return
+        message = self.performance_encoder.encode(reports, self.current_timestamp, keyframe=keyframe)
+        if message is not None and not self._publisher.publish(self._performance_topic, message):
+            # the consumers miss a delta, so they need a keyframe to recover
+            self.performance_encoder.request_keyframe()
+
+    def format_status(self) -> str:
+        status = super().format_status()
+        if self._publisher is not None:
+            status += f"\n\nMQTT publisher: {self._publisher.metrics()}"
+        return status
+
     def control_cash_out(self):
         self.evaluate_cash_out_time()
         if self.cashing_out:
@@ -245,7 +521,7 @@ class GenericV2StrategyWithCashOut(StrategyV2Base):
     def apply_initial_setting(self):
         connectors_position_mode = {}
         for controller_id, controller in self.controllers.items():
-            self.max_pnl_by_controller[controller_id] = Decimal("0")
+            self.pnl_by_controller[controller_id] = self.create_controller_pnl(controller_id)
             config_dict = controller.config.dict()
             if "connector_name" in config_dict:
                 if self.is_perpetual(config_dict["connector_name"]):
@@ -1,10 +1,10 @@
+import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
 import streamlit as st
 import yaml
 from hummingbot.connector.connector_base import OrderType
 from plotly.subplots import make_subplots
-from pykalman import KalmanFilter
 
 from backend.services.backend_api_client import BackendAPIClient
 from CONFIG import BACKEND_API_HOST, BACKEND_API_PORT
@@ -20,20 +20,45 @@ def get_candles(connector_name="binance", trading_pair="BTC-USDT", interval="1m"
     return backend_client.get_real_time_candles(connector_name, trading_pair, interval, max_records)
 
 
+def kalman_filter(values, initial_state_mean, initial_state_covariance, observation_covariance, transition_covariance):
+    """
+    Scalar Kalman filter of a random walk observed with noise, with the same output as pykalman and as the
+    kalman_filter_v1 controller. The gains do not depend on the data, so they are iterated until they reach their
+    steady value and the rest of the means is an exponential average with the steady gain.
+    """
+    n = len(values)
+    gains = np.empty(n)
+    covariances = np.empty(n)
+    predicted_covariance = initial_state_covariance
+    steady = n
+    for i in range(n):
+        if i > 0:
+            predicted_covariance = covariances[i - 1] + transition_covariance
+        gains[i] = predicted_covariance / (predicted_covariance + observation_covariance)
+        covariances[i] = predicted_covariance * (1 - gains[i])
+        if i > 0 and gains[i] == gains[i - 1]:
+            steady = i
+            break
+    gains[steady:] = gains[steady - 1]
+    covariances[steady:] = covariances[steady - 1]
+    means = np.empty(n)
+    predicted_mean = initial_state_mean
+    for i in range(steady):
+        means[i] = predicted_mean + gains[i] * (values[i] - predicted_mean)
+        predicted_mean = means[i]
+    if steady < n:
+        steady_values = pd.Series(np.concatenate(([predicted_mean], values[steady:])))
+        means[steady:] = steady_values.ewm(alpha=gains[steady], adjust=False).mean().to_numpy()[1:]
+    return means, covariances
+
+
 @st.cache_data
 def add_indicators(df, observation_covariance=1, transition_covariance=0.01, initial_state_covariance=0.001):
-    # Add Bollinger Bands
-    # Construct a Kalman filter
-    kf = KalmanFilter(transition_matrices=[1],
-                      observation_matrices=[1],
-                      initial_state_mean=df["close"].values[0],
-                      initial_state_covariance=initial_state_covariance,
-                      observation_covariance=observation_covariance,
-                      transition_covariance=transition_covariance)
-    mean, cov = kf.filter(df["close"].values)
-    df["kf"] = pd.Series(mean.flatten(), index=df["close"].index)
-    df["kf_upper"] = pd.Series(mean.flatten() + 1.96 * cov.flatten(), index=df["close"].index)
-    df["kf_lower"] = pd.Series(mean.flatten() - 1.96 * cov.flatten(), index=df["close"].index)
+    mean, cov = kalman_filter(df["close"].values, df["close"].values[0], initial_state_covariance,
+                              observation_covariance, transition_covariance)
+    df["kf"] = pd.Series(mean, index=df["close"].index)
+    df["kf_upper"] = pd.Series(mean + 1.96 * cov, index=df["close"].index)
+    df["kf_lower"] = pd.Series(mean - 1.96 * cov, index=df["close"].index)
 
     # Generate signal
     long_condition = df["close"] < df["kf_lower"]
@@ -181,14 +206,14 @@ st.plotly_chart(fig, use_container_width=True)
 c1, c2, c3 = st.columns([2, 2, 1])
 
 with c1:
-    config_base = st.text_input("Config Base", value=f"bollinger_v1-{connector_name}-{trading_pair.split('-')[0]}")
+    config_base = st.text_input("Config Base", value=f"kalman_filter_v1-{connector_name}-{trading_pair.split('-')[0]}")
 with c2:
     config_tag = st.text_input("Config Tag", value="1.1")
 
 id = f"{config_base}-{config_tag}"
 config = {
     "id": id,
-    "controller_name": "bollinger_v1",
+    "controller_name": "kalman_filter_v1",
     "controller_type": "directional_trading",
     "manual_kill_switch": None,
     "candles_config": [],
@@ -210,6 +235,10 @@ config = {
     "candles_connector": candles_connector,
     "candles_trading_pair": candles_trading_pair,
     "interval": interval,
+    "observation_covariance": observation_covariance,
+    "transition_covariance": transition_covariance,
+    "initial_state_covariance": 0.001,
+    "max_records": max_records,
 }
 
 yaml_config = yaml.dump(config, default_flow_style=False)
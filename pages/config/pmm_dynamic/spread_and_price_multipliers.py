@@ -1,6 +1,17 @@
+import numpy as np
 import pandas_ta as ta  # noqa: F401
 
 
+def rolling_zscore(series, window):
+    """
+    Rolling z-score with the sample standard deviation, as the streaming Welford state of the PMM Dynamic controller
+    computes it for the last candle
+    """
+    rolling = series.rolling(window, min_periods=2)
+    std = rolling.std()
+    return ((series - rolling.mean()) / std.where(std > 0)).astype(float)
+
+
 def get_pmm_dynamic_multipliers(df, macd_fast, macd_slow, macd_signal, natr_length):
     """
     Get the spread and price multipliers for PMM Dynamic
@@ -10,8 +21,9 @@ def get_pmm_dynamic_multipliers(df, macd_fast, macd_slow, macd_signal, natr_leng
                           slow=macd_slow, signal=macd_signal)
     macd = macd_output[f"MACD_{macd_fast}_{macd_slow}_{macd_signal}"]
     macdh = macd_output[f"MACDh_{macd_fast}_{macd_slow}_{macd_signal}"]
-    macd_signal = - (macd - macd.mean()) / macd.std()
-    macdh_signal = macdh.apply(lambda x: 1 if x > 0 else -1)
+    lookback = max(macd_fast, macd_slow, macd_signal, natr_length) + 200
+    macd_signal = - rolling_zscore(macd, lookback)
+    macdh_signal = np.where(macdh > 0, 1, -1)
     max_price_shift = natr / 2
     price_multiplier = ((0.5 * macd_signal + 0.5 * macdh_signal) * max_price_shift)
     return price_multiplier, natr
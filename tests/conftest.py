@@ -0,0 +1,22 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "bots"))
+
+
+def make_candles(n_candles: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 0.5, n_candles))
+    high = close + rng.random(n_candles)
+    low = close - rng.random(n_candles)
+    return pd.DataFrame({"timestamp": np.arange(n_candles) * 60.0, "open": close, "high": high, "low": low,
+                         "close": close, "volume": rng.random(n_candles)})
+
+
+@pytest.fixture
+def candles() -> pd.DataFrame:
+    return make_candles(2_000)
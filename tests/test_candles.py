@@ -0,0 +1,112 @@
+import asyncio
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("hummingbot")
+
+from conftest import make_candles  # noqa: E402
+from controllers.candles import CANDLE_DTYPE, CandleCloseGate, CandlesRingBuffer  # noqa: E402
+
+COLUMNS = list(CANDLE_DTYPE.names)
+
+
+class FeedWithRows:
+    def __init__(self, rows):
+        self._candles = rows
+
+
+class FeedWithDataFrame:
+    def __init__(self, rows):
+        self.candles_df = pd.DataFrame(rows, columns=COLUMNS)
+
+
+def candle_rows(n_candles: int, seed: int = 0):
+    return make_candles(n_candles, seed)[COLUMNS].to_numpy().tolist()
+
+
+def assert_buffer_matches(candles: CandlesRingBuffer, rows):
+    expected = np.array(rows[-candles.capacity:], dtype=np.float64)
+    view = candles.view()
+    np.testing.assert_array_equal(np.column_stack([view[name] for name in COLUMNS]), expected)
+
+
+def test_appends_new_candles_and_wraps_around():
+    rows = candle_rows(100)
+    candles = CandlesRingBuffer(10)
+    for end in range(1, len(rows) + 1):
+        candles.sync(rows[:end])
+        assert_buffer_matches(candles, rows[:end])
+    assert len(candles) == 10
+    candles.sync(rows[:60] + rows[70:])
+    assert_buffer_matches(candles, rows[:60] + rows[70:])
+
+
+def test_revises_the_forming_candle():
+    rows = candle_rows(30)
+    candles = CandlesRingBuffer(20)
+    candles.sync(rows)
+    for close in [1.0, 2.0, 3.0]:
+        rows[-1] = rows[-1][:4] + [close, rows[-1][5] + 1]
+        candles.sync(rows)
+        assert_buffer_matches(candles, rows)
+    rows.append([rows[-1][0] + 60, 3.0, 4.0, 2.0, 3.5, 1.0])
+    candles.sync(rows)
+    assert_buffer_matches(candles, rows)
+
+
+def test_view_is_read_only():
+    candles = CandlesRingBuffer(10)
+    candles.sync(candle_rows(5))
+    with pytest.raises(ValueError):
+        candles.view()["close"][0] = 0.0
+
+
+def test_sync_feed_reads_the_rows_or_the_public_dataframe():
+    rows = candle_rows(50)
+    from_rows = CandlesRingBuffer(30)
+    from_dataframe = CandlesRingBuffer(30)
+    for end in [40, 45, 50]:
+        from_rows.sync_feed(FeedWithRows(rows[:end]))
+        from_dataframe.sync_feed(FeedWithDataFrame(rows[:end]))
+        np.testing.assert_array_equal(from_rows.view(), from_dataframe.view())
+
+
+def test_sync_feed_matches_the_candles_df_of_a_hummingbot_feed():
+    from hummingbot.data_feed.candles_feed.candles_factory import CandlesFactory
+    from hummingbot.data_feed.candles_feed.data_types import CandlesConfig
+
+    async def build_feed():
+        return CandlesFactory.get_candle(CandlesConfig(connector="binance", trading_pair="BTC-USDT", interval="1m",
+                                                       max_records=50))
+
+    feed = asyncio.run(build_feed())
+    # sync_feed reads the rows the feed keeps in _candles, pinned here against its public candles_df
+    assert hasattr(feed, "_candles")
+    for row in candle_rows(60):
+        feed._candles.append(row + [0.0] * (len(feed.columns) - len(row)))
+    candles = CandlesRingBuffer(50)
+    candles.sync_feed(feed)
+    pd.testing.assert_frame_equal(candles.to_frame(), feed.candles_df[COLUMNS].reset_index(drop=True),
+                                  check_dtype=False)
+
+
+def test_gate_last_value_reads_closed_or_forming_candle():
+    signal = np.array([1, 0, -1])
+    assert CandleCloseGate.last_value(signal) == 0
+    assert CandleCloseGate.last_value(signal, intra_candle=True) == -1
+    assert CandleCloseGate.last_value(pd.Series(signal, index=[5, 6, 7])) == 0
+    assert CandleCloseGate.last_value(signal[-1:]) == -1
+
+
+def test_gate_updates_once_per_candle():
+    candles = CandlesRingBuffer(10)
+    candles.sync(candle_rows(5))
+    gate = CandleCloseGate("1m")
+    last_timestamp = candles.view()["timestamp"][-1]
+    assert gate.should_update(last_timestamp + 30)
+    gate.processed(candles.view())
+    assert not gate.should_update(last_timestamp + 59)
+    assert gate.should_update(last_timestamp + 59, intra_candle=True)
+    assert gate.should_update(last_timestamp + 60)
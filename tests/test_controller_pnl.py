@@ -0,0 +1,67 @@
+from decimal import Decimal
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("hummingbot")
+
+from hummingbot.strategy_v2.models.base import RunnableStatus  # noqa: E402
+from hummingbot.strategy_v2.models.executors import CloseType  # noqa: E402
+from scripts.v2_with_controllers import ControllerPnl  # noqa: E402
+
+
+def executor(executor_id: str, net_pnl_quote: str, is_active: bool = True, close_type=None):
+    return SimpleNamespace(id=executor_id, is_active=is_active, net_pnl_quote=Decimal(net_pnl_quote),
+                           status=RunnableStatus.RUNNING if is_active else RunnableStatus.TERMINATED,
+                           filled_amount_quote=Decimal("100"), close_type=close_type)
+
+
+def test_finished_executor_is_realized_once():
+    pnl = ControllerPnl()
+    assert pnl.update([executor("a", "5"), executor("b", "-1")])
+    assert pnl.global_pnl_quote == Decimal("4")
+    assert not pnl.update([executor("a", "5"), executor("b", "-1")])
+
+    finished = [executor("a", "7", is_active=False, close_type=CloseType.TAKE_PROFIT), executor("b", "-5")]
+    assert pnl.update(finished)
+    assert pnl.realized_pnl_quote == Decimal("7")
+    assert pnl.unrealized_pnl_quote == Decimal("-5")
+    assert not pnl.update(finished)
+    assert pnl.global_pnl_quote == Decimal("2")
+    assert pnl.max_global_pnl_quote == Decimal("4")
+    assert pnl.drawdown_quote == Decimal("2")
+
+
+def test_position_hold_is_counted_in_the_positions():
+    pnl = ControllerPnl()
+    pnl.update([executor("a", "2")])
+    pnl.update([executor("a", "2", is_active=False, close_type=CloseType.POSITION_HOLD)],
+               positions_pnl_quote=Decimal("2"))
+    assert pnl.realized_pnl_quote == Decimal("0")
+    assert pnl.global_pnl_quote == Decimal("2")
+    pnl.update([executor("a", "2", is_active=False, close_type=CloseType.POSITION_HOLD)],
+               positions_pnl_quote=Decimal("-6"))
+    assert pnl.global_pnl_quote == Decimal("-6")
+    assert pnl.drawdown_quote == Decimal("8")
+
+
+def test_restart_seeds_from_the_performance_report():
+    # the report includes 95 of executors stored in the database, the active executor and the held position
+    pnl = ControllerPnl()
+    pnl.update([executor("a", "2")], positions_pnl_quote=Decimal("3"))
+    pnl.seed(Decimal("100"))
+    assert pnl.global_pnl_quote == Decimal("100")
+    assert pnl.max_global_pnl_quote == Decimal("100")
+
+    pnl.update([executor("a", "-4", is_active=False, close_type=CloseType.STOP_LOSS)],
+               positions_pnl_quote=Decimal("1"))
+    assert pnl.global_pnl_quote == Decimal("92")
+    assert pnl.drawdown_quote == Decimal("8")
+
+
+def test_held_position_pnl_change_is_reported():
+    executors = [executor("a", "2", is_active=False, close_type=CloseType.POSITION_HOLD)]
+    pnl = ControllerPnl()
+    assert pnl.update(executors, positions_pnl_quote=Decimal("2"))
+    assert not pnl.update(executors, positions_pnl_quote=Decimal("2"))
+    assert pnl.update(executors, positions_pnl_quote=Decimal("2.5"))
@@ -0,0 +1,49 @@
+import asyncio
+from decimal import Decimal
+
+import numpy as np
+import pytest
+
+pytest.importorskip("hummingbot")
+
+from controllers.directional_trading.dman_v3 import DManV3Controller, DManV3ControllerConfig  # noqa: E402
+from hummingbot.core.data_type.common import TradeType  # noqa: E402
+
+
+class FakeCandlesFeed:
+    def __init__(self, candles):
+        self.candles_df = candles
+
+
+class FakeMarketDataProvider:
+    def __init__(self, candles):
+        self.feed = FakeCandlesFeed(candles)
+        self.current_time = float(candles["timestamp"].iloc[-1]) + 30
+
+    def initialize_candles_feed(self, candles_config):
+        pass
+
+    def get_candles_feed(self, candles_config):
+        return self.feed
+
+    def time(self):
+        return self.current_time
+
+
+def test_spread_multiplier_with_compact_features(candles):
+    config = DManV3ControllerConfig(
+        id="dman_v3_compact", connector_name="binance_perpetual", trading_pair="BTC-USDT",
+        candles_trading_pair="DMAN-COMPACT", interval="1m", dca_spreads="0.01,0.02", dca_amounts_pct="1,1",
+        dynamic_order_spread=True, dynamic_target=False, intra_candle_evaluation=False,
+        features_retention="compact")
+    controller = DManV3Controller(config, market_data_provider=FakeMarketDataProvider(candles),
+                                  actions_queue=asyncio.Queue())
+    asyncio.run(controller.update_processed_data())
+    assert controller.processed_data["features"]["BBB_100_2.0"].dtype == np.float32
+
+    spread_multiplier = controller.get_spread_multiplier()
+    closed_bb_width = controller.bbands.values(2)[0, controller.bbands.columns.index("BBB_100_2.0")]
+    assert float(spread_multiplier) == pytest.approx(closed_bb_width / 200, rel=1e-6)
+
+    executor_config = controller.get_executor_config(TradeType.BUY, Decimal("100"), Decimal("1"))
+    assert all(price < Decimal("100") for price in executor_config.prices)
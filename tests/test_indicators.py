@@ -0,0 +1,88 @@
+import numpy as np
+import pytest
+
+from controllers import indicators
+
+
+@pytest.fixture
+def ta():
+    return pytest.importorskip("pandas_ta")
+
+
+def python_loop(kernel):
+    """
+    The plain Python version of a kernel, whether numba compiled it or not.
+    """
+    return getattr(kernel, "py_func", kernel)
+
+
+def as_matrix(values) -> np.ndarray:
+    return np.column_stack(values) if isinstance(values, tuple) else np.asarray(values).reshape(len(values), -1)
+
+
+def assert_matches(result, reference, tolerance=1e-8):
+    result = as_matrix(result)
+    reference = as_matrix(reference)
+    np.testing.assert_array_equal(np.isnan(result), np.isnan(reference))
+    np.testing.assert_allclose(result, reference, rtol=tolerance, atol=tolerance, equal_nan=True)
+
+
+def test_bbands(candles, ta):
+    result = indicators.bbands(candles["close"], 100, 2.0)
+    assert_matches(result, ta.bbands(candles["close"], length=100, std=2.0).iloc[:, :5])
+
+
+def test_ema(candles, ta):
+    assert_matches(indicators.ema(candles["close"], 26), ta.ema(candles["close"], length=26))
+
+
+def test_macd(candles, ta):
+    assert_matches(indicators.macd(candles["close"], 12, 26, 9), ta.macd(candles["close"], fast=12, slow=26, signal=9))
+
+
+def test_natr(candles, ta):
+    assert_matches(indicators.natr(candles["high"], candles["low"], candles["close"], 14),
+                   ta.natr(candles["high"], candles["low"], candles["close"], length=14))
+
+
+def test_rma(candles, ta):
+    assert_matches(indicators.rma(candles["close"], 14), ta.rma(candles["close"], length=14))
+
+
+def test_supertrend(candles, ta):
+    result = indicators.supertrend(candles["high"], candles["low"], candles["close"], 20, 4.0)
+    assert_matches(result, ta.supertrend(candles["high"], candles["low"], candles["close"], length=20,
+                                         multiplier=4.0))
+
+
+@pytest.mark.parametrize("gap", [None, 500])
+def test_ema_matches_loop(candles, gap):
+    close = candles["close"].to_numpy().copy()
+    if gap is not None:
+        close[gap] = np.nan
+    seed = close[:26].mean()
+    assert_matches(indicators.ema(close, 26), python_loop(indicators._ema_loop)(close, 2 / 27, 25, seed), 1e-12)
+
+
+@pytest.mark.parametrize("gap", [None, 500])
+def test_rma_matches_loop(candles, gap):
+    close = candles["close"].to_numpy().copy()
+    if gap is not None:
+        close[gap] = np.nan
+    reference = python_loop(indicators._ewm_adjusted_loop)(close, 1 - 1 / 14)
+    reference[np.cumsum(~np.isnan(close)) < 14] = np.nan
+    assert_matches(indicators.rma(close, 14), reference, 1e-12)
+
+
+def test_rolling_zscore_matches_loop(candles):
+    close = candles["close"].to_numpy()
+    assert_matches(indicators.rolling_zscore(close, 200),
+                   python_loop(indicators._rolling_zscore_loop)(close, 200), 1e-8)
+
+
+def test_kalman_filter_matches_loop(candles):
+    close = candles["close"].to_numpy()
+    mean = np.empty(len(close))
+    covariance = np.empty(len(close))
+    python_loop(indicators._kalman_filter_loop)(close, close[0], 0.001, 1.0, 0.001, mean, covariance)
+    assert_matches(indicators.kalman_filter(close, close[0], 0.001, 1.0, 0.001), (mean, covariance), 1e-10)
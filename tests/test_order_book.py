@@ -0,0 +1,76 @@
+from collections import namedtuple
+
+import numpy as np
+import pytest
+
+pytest.importorskip("hummingbot")
+
+from controllers.order_book import OrderBookMirror  # noqa: E402
+
+OrderBookRow = namedtuple("OrderBookRow", ["price", "amount", "update_id"])
+
+
+class FakeOrderBook:
+    """
+    Implements the parts of hummingbot's OrderBook the mirror reads and counts the entries walked.
+    """
+    def __init__(self, n_levels: int, seed: int = 0):
+        rng = np.random.default_rng(seed)
+        self.bids = [OrderBookRow(100 - 0.1 * i, float(amount), 1) for i, amount in enumerate(rng.random(n_levels))]
+        self.asks = [OrderBookRow(100.1 + 0.1 * i, float(amount), 1) for i, amount in enumerate(rng.random(n_levels))]
+        self.snapshot_uid = 1
+        self.last_diff_uid = 1
+        self.entries_walked = 0
+
+    def _walk(self, rows):
+        for row in rows:
+            self.entries_walked += 1
+            yield row
+
+    def bid_entries(self):
+        return self._walk(self.bids)
+
+    def ask_entries(self):
+        return self._walk(self.asks)
+
+
+def walk_price_for_quote_volume(rows, quote_volume):
+    cumulative = 0.0
+    for row in rows:
+        cumulative += row.price * row.amount
+        if cumulative >= quote_volume:
+            return row.price
+    return np.nan
+
+
+def test_prices_match_walking_the_book():
+    book = FakeOrderBook(500)
+    mirror = OrderBookMirror(max_depth=500)
+    mirror.sync(book)
+    for quote_volume in [1.0, 50.0, 500.0, 5_000.0, 1e9]:
+        np.testing.assert_equal(mirror.price_for_quote_volume(True, quote_volume),
+                                walk_price_for_quote_volume(book.asks, quote_volume))
+        np.testing.assert_equal(mirror.price_for_quote_volume(False, quote_volume),
+                                walk_price_for_quote_volume(book.bids, quote_volume))
+
+
+def test_rebuilds_lazily_up_to_max_depth():
+    book = FakeOrderBook(1_000)
+    mirror = OrderBookMirror(max_depth=20)
+    assert mirror.sync(book)
+    assert book.entries_walked == 0
+    assert mirror.best_ask == book.asks[0].price
+    assert book.entries_walked == 40
+    assert len(mirror.asks) == 20
+    deeper_than_mirror = sum(row.price * row.amount for row in book.asks[:30])
+    assert np.isnan(mirror.price_for_quote_volume(True, deeper_than_mirror))
+
+    assert not mirror.sync(book)
+    mirror.price_for_quote_volume(True, 1.0)
+    assert book.entries_walked == 40
+
+    book.last_diff_uid += 1
+    book.asks[0] = OrderBookRow(100.05, 1.0, 2)
+    assert mirror.sync(book)
+    assert mirror.best_ask == 100.05
+    assert book.entries_walked == 80
@@ -0,0 +1,85 @@
+from decimal import Decimal
+
+import pytest
+
+from controllers.performance_messages import PerformanceDeltaEncoder, PerformanceStateAssembler
+
+
+def report(global_pnl_quote, volume_traded, close_type_counts=None):
+    return {"global_pnl_quote": Decimal(global_pnl_quote), "volume_traded": Decimal(volume_traded),
+            "close_type_counts": close_type_counts or {}}
+
+
+def reports_sequence():
+    """
+    Reports of successive intervals: unchanged reports, changed fields, a new controller and a removed one.
+    """
+    first = {"controller_a": report("1", "100"), "controller_b": report("0", "0")}
+    yield first
+    yield first
+    yield {"controller_a": report("1.5", "100"), "controller_b": first["controller_b"]}
+    yield {"controller_a": report("1.5", "150", {"TAKE_PROFIT": 1}), "controller_b": report("-0.2", "10"),
+           "controller_c": report("0", "0")}
+    yield {"controller_a": report("2", "150", {"TAKE_PROFIT": 1}), "controller_c": report("0.1", "20")}
+    yield {"controller_a": report("2", "160", {"TAKE_PROFIT": 2}), "controller_c": report("0.1", "20")}
+
+
+def test_deltas_rebuild_the_reports():
+    encoder = PerformanceDeltaEncoder(keyframe_interval=60)
+    assembler = PerformanceStateAssembler()
+    sent = 0
+    for timestamp, reports in enumerate(reports_sequence()):
+        message = encoder.encode(reports, timestamp)
+        if message is None:
+            continue
+        sent += 1
+        assert assembler.apply(message)
+        assert assembler.reports == reports
+    # the first message is a keyframe and the repeated reports are not sent
+    assert sent == 5
+
+
+def test_deltas_only_carry_changed_fields():
+    encoder = PerformanceDeltaEncoder(keyframe_interval=60)
+    encoder.encode({"controller_a": report("1", "100")}, 0)
+    message = encoder.encode({"controller_a": report("2", "100")}, 1)
+    assert message["type"] == "delta"
+    assert message["changed"] == {"controller_a": {"global_pnl_quote": Decimal("2")}}
+
+
+def test_missed_delta_resyncs_on_next_keyframe():
+    encoder = PerformanceDeltaEncoder(keyframe_interval=4)
+    assembler = PerformanceStateAssembler()
+    messages = [(reports, encoder.encode(reports, timestamp)) for timestamp, reports in enumerate(reports_sequence())]
+    messages = [(reports, message) for reports, message in messages if message is not None]
+    # the second message (a delta) is lost
+    assert assembler.apply(messages[0][1])
+    applied = [assembler.apply(message) for _, message in messages[2:]]
+    keyframe = next(i for i, (_, message) in enumerate(messages[2:]) if message["type"] == "keyframe")
+    assert keyframe > 0
+    assert applied[:keyframe] == [False] * keyframe
+    assert all(applied[keyframe:])
+    assert assembler.reports == messages[-1][0]
+
+
+def test_requested_keyframe_follows_a_dropped_message():
+    encoder = PerformanceDeltaEncoder(keyframe_interval=60)
+    encoder.encode({"controller_a": report("1", "100")}, 0)
+    encoder.encode({"controller_a": report("2", "100")}, 1)
+    encoder.request_keyframe()
+    assert encoder.encode({"controller_a": report("3", "100")}, 2)["type"] == "keyframe"
+
+
+def test_msgpack_round_trip():
+    pytest.importorskip("msgpack")
+    encoder = PerformanceDeltaEncoder(keyframe_interval=60, use_msgpack=True)
+    assembler = PerformanceStateAssembler()
+    for timestamp, reports in enumerate(reports_sequence()):
+        message = encoder.encode(reports, timestamp)
+        if message is None:
+            continue
+        assert message["encoding"] == "msgpack"
+        assert assembler.apply(message)
+        assert assembler.reports == {controller_id: {key: float(value) if isinstance(value, Decimal) else value
+                                                     for key, value in report.items()}
+                                     for controller_id, report in reports.items()}
@@ -0,0 +1,151 @@
+import numpy as np
+import pytest
+
+from controllers import indicators
+from controllers.streaming_indicators import (
+    StreamingBollingerBands,
+    StreamingKalmanFilter,
+    StreamingMACD,
+    StreamingNATR,
+    StreamingSuperTrend,
+    StreamingZScore,
+)
+
+WINDOW = 300
+
+
+@pytest.fixture
+def ta():
+    return pytest.importorskip("pandas_ta")
+
+
+@pytest.fixture
+def candles(candles):
+    # StreamingZScore reads a value column, fed here with the closes
+    return candles.assign(value=candles["close"])
+
+
+def stream(indicator, candles):
+    """
+    Feeds the indicator with a sliding window of the candles, one new candle at a time, as the candles feed does.
+    """
+    for end in range(WINDOW, len(candles) + 1):
+        indicator.update(candles.iloc[end - WINDOW:end])
+    return indicator.values(WINDOW)
+
+
+def reference_macd(candles):
+    return np.column_stack(indicators.macd(candles["close"], 12, 26, 9))
+
+
+def reference_natr(candles):
+    return indicators.natr(candles["high"], candles["low"], candles["close"], 14).reshape(-1, 1)
+
+
+def reference_bbands(candles):
+    return np.column_stack(indicators.bbands(candles["close"], 20, 2.0))
+
+
+def reference_supertrend(candles):
+    return np.column_stack(indicators.supertrend(candles["high"], candles["low"], candles["close"], 7, 3.0))
+
+
+def reference_zscore(candles):
+    return indicators.rolling_zscore(candles["value"], 50).reshape(-1, 1)
+
+
+def reference_kalman_filter(candles):
+    close = candles["close"].to_numpy()
+    mean, covariance = indicators.kalman_filter(close, close[0], 0.001, 1.0, 0.001)
+    return np.column_stack((mean, mean + 1.96 * covariance, mean - 1.96 * covariance))
+
+
+INDICATORS = [
+    (lambda: StreamingMACD(12, 26, 9, max_history=WINDOW), reference_macd),
+    (lambda: StreamingNATR(14, max_history=WINDOW), reference_natr),
+    (lambda: StreamingBollingerBands(20, 2.0, max_history=WINDOW), reference_bbands),
+    (lambda: StreamingSuperTrend(7, 3.0, max_history=WINDOW), reference_supertrend),
+    (lambda: StreamingZScore(50, max_history=WINDOW), reference_zscore),
+    (lambda: StreamingKalmanFilter(1.0, 0.001, 0.001, max_history=WINDOW), reference_kalman_filter),
+]
+INDICATOR_IDS = ["macd", "natr", "bbands", "supertrend", "zscore", "kalman_filter"]
+
+
+def assert_tail_matches(values, reference, tolerance=1e-8):
+    np.testing.assert_allclose(values, np.asarray(reference)[-len(values):], rtol=tolerance, atol=tolerance,
+                               equal_nan=True)
+
+
+def test_macd_matches_pandas_ta(candles, ta):
+    values = stream(StreamingMACD(12, 26, 9, max_history=WINDOW), candles)
+    assert_tail_matches(values, ta.macd(candles["close"], fast=12, slow=26, signal=9).to_numpy())
+
+
+def test_natr_matches_pandas_ta(candles, ta):
+    values = stream(StreamingNATR(14, max_history=WINDOW), candles)
+    reference = ta.natr(candles["high"], candles["low"], candles["close"], length=14).to_numpy().reshape(-1, 1)
+    assert_tail_matches(values, reference)
+
+
+@pytest.mark.parametrize("indicator, reference", INDICATORS, ids=INDICATOR_IDS)
+def test_matches_kernels(candles, indicator, reference):
+    assert_tail_matches(stream(indicator(), candles), reference(candles))
+
+
+@pytest.mark.parametrize("indicator, reference", INDICATORS, ids=INDICATOR_IDS)
+def test_forming_candle_revisions_then_close(candles, indicator, reference):
+    indicator = indicator()
+    history = candles.iloc[:WINDOW + 100].copy()
+    stream(indicator, history.iloc[:WINDOW + 99])
+    forming = history.index[-2]
+    for shift in (0.8, -1.5, 0.3):
+        revised = history.iloc[:WINDOW + 99].copy()
+        revised.loc[forming, list(indicator.inputs)] += shift
+        indicator.update(revised.iloc[-WINDOW:])
+        assert_tail_matches(indicator.values(1), reference(revised))
+    # the candle closes with its final values and a new candle starts forming
+    indicator.update(history.iloc[-WINDOW:])
+    assert_tail_matches(indicator.values(WINDOW), reference(history))
+
+
+@pytest.mark.parametrize("indicator, reference", INDICATORS, ids=INDICATOR_IDS)
+def test_what_if_leaves_state_unchanged(candles, indicator, reference):
+    indicator = indicator()
+    history = candles.iloc[:WINDOW + 50]
+    stream(indicator, history.iloc[:WINDOW + 49])
+    before = indicator.values(WINDOW).copy()
+    last_close = history["close"].iloc[-2]
+    inputs = {"high": last_close + 2, "low": last_close - 2, "close": last_close + 1, "value": last_close + 1}
+    what_if = indicator.what_if(**inputs)
+    np.testing.assert_array_equal(indicator.values(WINDOW), before)
+
+    revised = history.iloc[:WINDOW + 49].copy()
+    for name, value in inputs.items():
+        revised.loc[revised.index[-1], name] = value
+    assert_tail_matches(np.array([list(what_if.values())]), reference(revised))
+
+    # the next candle commits the real values of the forming candle, not the what-if ones
+    indicator.update(history.iloc[-WINDOW:])
+    assert_tail_matches(indicator.values(WINDOW), reference(history))
+
+
+@pytest.mark.parametrize("indicator, reference", INDICATORS, ids=INDICATOR_IDS)
+def test_several_new_candles_in_one_update(candles, indicator, reference):
+    indicator = indicator()
+    history = candles.iloc[:WINDOW + 100]
+    stream(indicator, history.iloc[:WINDOW + 80])
+    # the feed delivers the last 20 candles at once
+    indicator.update(history.iloc[-WINDOW:])
+    assert_tail_matches(indicator.values(WINDOW), reference(history))
+
+
+@pytest.mark.parametrize("indicator, reference", INDICATORS, ids=INDICATOR_IDS)
+def test_skipped_candles_rebuild_from_the_window(candles, indicator, reference):
+    indicator = indicator()
+    stream(indicator, candles.iloc[:WINDOW + 10])
+    # the window no longer contains the last candle seen, so the state is rebuilt from the window alone
+    window = candles.iloc[WINDOW + 500:2 * WINDOW + 500]
+    indicator.update(window)
+    assert_tail_matches(indicator.values(WINDOW), reference(window))
+    indicator.update(candles.iloc[WINDOW + 501:2 * WINDOW + 501])
+    assert_tail_matches(indicator.values(WINDOW), reference(candles.iloc[WINDOW + 500:2 * WINDOW + 501]))